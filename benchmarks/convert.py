@@ -0,0 +1,59 @@
+"""Wall time of `deps convert` when the cache is already warm.
+
+    ```
+    python3 -m benchmarks.convert --path requirements.in --runs 5
+    ```
+
+Every run is a new process, as it is for users, so it includes loading
+of the cache records and making releases from them. The first run fills
+the cache (it needs network) and isn't counted. Runs are made in a temporary
+directory, so the config of the current project isn't used.
+"""
+
+# built-in
+import subprocess
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from statistics import median
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+
+def run(path: Path, output: Path, cache: Path, backend: str) -> float:
+    command = [
+        sys.executable, '-m', 'dephell', 'deps', 'convert',
+        '--from-format', 'pip', '--from-path', str(path),
+        '--to-format', 'piplock', '--to-path', str(output),
+        '--cache-path', str(cache),
+        '--cache-backend', backend,
+        '--level', 'ERROR',
+        '--silent',
+    ]
+    start = perf_counter()
+    subprocess.run(command, check=True, stdout=subprocess.DEVNULL, cwd=str(output.parent))
+    return perf_counter() - start
+
+
+def main(argv=None):
+    parser = ArgumentParser()
+    parser.add_argument('--path', required=True, help='requirements file to resolve')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--backend', default='files', help='cache backend: files or sqlite')
+    parser.add_argument('--cache-path', help='cache dir, a new one by default')
+    args = parser.parse_args(argv)
+    path = Path(args.path).resolve()
+
+    with TemporaryDirectory() as tmp:
+        output = Path(tmp) / 'requirements.lock'
+        cache = Path(args.cache_path or tmp).resolve() / 'cache'
+        cold = run(path=path, output=output, cache=cache, backend=args.backend)
+        timings = [run(path=path, output=output, cache=cache, backend=args.backend) for _ in range(args.runs)]
+
+    print('cold, s:    ', round(cold, 3))
+    print('warm min, s:', round(min(timings), 3))
+    print('warm med, s:', round(median(timings), 3))
+
+
+if __name__ == '__main__':
+    main()
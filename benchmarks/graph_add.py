@@ -0,0 +1,64 @@
+"""Micro-benchmark for inserting dependencies into the resolver graph.
+
+    ```
+    python3 -m benchmarks.graph_add
+    ```
+
+Every new dependency is attached to a random parent that is already in the graph,
+so the graph grows in depth and width at the same time. If insertion is O(1),
+time per insert stays flat while the graph grows.
+"""
+
+# built-in
+import random
+from logging import getLogger
+from time import perf_counter
+
+# project
+from dephell.controllers import Graph
+from dephell.models import RootDependency
+
+
+SIZES = (100, 1000, 10000, 50000)
+
+
+class Node:
+    """The smallest thing that Graph accepts as a dependency.
+    """
+    applied = False
+    used = True
+
+    def __init__(self, name: str, parent: str):
+        self.name = name
+        self.constraint = self
+        self.sources = {parent}
+
+
+def bench(size: int, seed: int = 42):
+    rnd = random.Random(seed)
+    root = RootDependency(raw_name='root')
+    graph = Graph(root)
+    names = [root.name]
+    nodes = []
+    for index in range(size):
+        name = 'dep{}'.format(index)
+        nodes.append(Node(name=name, parent=rnd.choice(names)))
+        names.append(name)
+
+    start = perf_counter()
+    for node in nodes:
+        graph.add(node)
+    return (perf_counter() - start) / size, len(graph._layers)
+
+
+def main():
+    # graph complains about root without dependencies
+    getLogger('dephell').setLevel('ERROR')
+    print('{:>8} {:>14} {:>8}'.format('deps', 'per insert, us', 'layers'))
+    for size in SIZES:
+        per_insert, layers = bench(size)
+        print('{:>8} {:>14.2f} {:>8}'.format(size, per_insert * 10 ** 6, layers))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Memory used by releases of big packages.
+
+    ```
+    python3 -m benchmarks.releases --packages 50 --versions 2000
+    ```
+
+Every release is made twice, as it happens when the same package comes
+from the cache and from the repo. For a whole resolve see `benchmarks.resolve`.
+"""
+
+# built-in
+import tracemalloc
+from argparse import ArgumentParser
+from datetime import datetime
+from time import perf_counter
+
+# project
+from dephell.models import Release
+
+
+TIME = datetime(2019, 1, 1)
+
+
+def make_releases(packages: int, versions: int, files: int) -> list:
+    releases = []
+    for _copy in range(2):
+        for package in range(packages):
+            name = 'Package_{}'.format(package)
+            for version in range(versions):
+                version = '{}.{}.{}'.format(version // 100, version // 10 % 10, version % 10)
+                hashes = ['{:064x}'.format(hash((name, version, index)) % 2 ** 256) for index in range(files)]
+                releases.append(Release(raw_name=name, version=version, time=TIME, hashes=hashes))
+    return releases
+
+
+def main(argv=None):
+    parser = ArgumentParser()
+    parser.add_argument('--packages', type=int, default=50)
+    parser.add_argument('--versions', type=int, default=2000)
+    parser.add_argument('--files', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    tracemalloc.start()
+    start = perf_counter()
+    releases = make_releases(packages=args.packages, versions=args.versions, files=args.files)
+    elapsed = perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print('releases:   ', len(releases))
+    print('time, s:    ', round(elapsed, 3))
+    print('peak, MiB:  ', round(peak / 2 ** 20, 2))
+    print('kept, MiB:  ', round(current / 2 ** 20, 2))
+    print('per release:', current // len(releases), 'bytes')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""Wall time and memory allocations of the whole resolving.
+
+Resolve a real requirements file (it needs network or warm cache):
+
+    ```
+    python3 -m benchmarks.resolve --path requirements.txt
+    ```
+
+Resolve a synthetic graph with fake repository (offline and reproducible):
+
+    ```
+    python3 -m benchmarks.resolve --packages 300 --versions 30
+    ```
+
+Relock the synthetic graph after a bump of one root requirement,
+with and without pins from the previous lock (`deps convert --incremental`):
+
+    ```
+    python3 -m benchmarks.resolve --packages 300 --versions 30 --relock
+    ```
+"""
+
+# built-in
+import random
+import tracemalloc
+from argparse import ArgumentParser
+from logging import getLogger
+from time import perf_counter
+from typing import Optional
+from unittest.mock import patch
+
+# project
+from dephell.controllers import Graph, Resolver, get_mutator
+from dephell.converters import PIPConverter
+
+# app
+from tests.helpers import Fake, make_root
+
+
+def make_synthetic(packages: int, versions: int, deps: int, seed: int = 42,
+                   root_reqs: Optional[list] = None):
+    """Make DAG of fake packages. Every release depends on a few packages
+    with higher index and sometimes restricts their versions.
+
+    root_reqs -- root requirements, a few first packages by default.
+    """
+    rnd = random.Random(seed)
+    names = ['pkg{}'.format(index) for index in range(packages)]
+    releases = dict()
+    for index, name in enumerate(names):
+        fakes = []
+        for version in range(1, versions + 1):
+            children = names[index + 1:index + 1 + deps * 4]
+            reqs = []
+            for child in rnd.sample(children, min(deps, len(children))):
+                bound = rnd.randint(1, versions)
+                reqs.append(rnd.choice((child, child + '>=' + str(bound), child + '<=' + str(bound))))
+            fakes.append(Fake(str(version), *reqs))
+        releases[name] = tuple(fakes)
+    if root_reqs is None:
+        root_reqs = names[:max(1, packages // 20)]
+    return make_root(root=Fake('', *root_reqs), **releases)
+
+
+def run(resolver, silent: bool = True):
+    tracemalloc.start()
+    start = perf_counter()
+    resolved = resolver.resolve(silent=silent)
+    elapsed = perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resolved, elapsed, current, peak
+
+
+def run_synthetic(args, reqs=None, lock=None):
+    root = make_synthetic(packages=args.packages, versions=args.versions, deps=args.deps, root_reqs=reqs)
+    resolver = Resolver(graph=Graph(root), mutator=get_mutator(args.resolver))
+    if lock is not None:
+        resolver.attach_pins(lock)
+
+    # count loaded deps of releases, every call is a request for a real repo
+    calls = []
+    get_dependencies = root.repo.get_dependencies
+
+    def counted(*args, **kwargs):
+        calls.append(args or kwargs)
+        return get_dependencies(*args, **kwargs)
+
+    root.repo.get_dependencies = counted
+    with patch(target='dephell.controllers._dependency.get_repo', return_value=root.repo):
+        result = run(resolver)
+    return resolver, result, len(calls)
+
+
+def relock(args) -> None:
+    resolver, result, _calls = run_synthetic(args)
+    pins = ['{}=={}'.format(dep.name, dep.group.best_release.version) for dep in resolver.graph]
+    lock = make_synthetic(packages=args.packages, versions=args.versions, deps=args.deps, root_reqs=pins)
+
+    # the first root requirement is bumped down, so its subgraph is changed
+    reqs = ['pkg{}'.format(index) for index in range(max(1, args.packages // 20))]
+    reqs[0] += '<' + str(resolver.graph.get(reqs[0]).group.best_release.version)
+
+    for name, lock in (('full', None), ('incremental', lock)):
+        resolver, result, calls = run_synthetic(args, reqs=reqs, lock=lock)
+        resolved, elapsed, _current, _peak = result
+        pinned = sum(1 for dep in resolver.graph if dep.group.number == dep.groups.pinned_number)
+        print(name)
+        print('  resolved:   ', resolved)
+        print('  nodes:      ', len(resolver.graph.names))
+        print('  pinned:     ', pinned)
+        print('  mutations:  ', resolver.mutator.mutations)
+        print('  deps loaded:', calls)
+        print('  time, s:    ', round(elapsed, 3))
+
+
+def main(argv=None):
+    parser = ArgumentParser()
+    parser.add_argument('--path', help='requirements file to resolve')
+    parser.add_argument('--packages', type=int, default=200)
+    parser.add_argument('--versions', type=int, default=20)
+    parser.add_argument('--deps', type=int, default=3)
+    parser.add_argument('--resolver', default='mutator')
+    parser.add_argument('--relock', action='store_true', help='compare full and incremental relock')
+    args = parser.parse_args(argv)
+    getLogger('dephell').setLevel('ERROR')
+
+    if args.relock:
+        relock(args)
+        return
+
+    if args.path:
+        resolver = PIPConverter(lock=False).load_resolver(path=args.path)
+        resolver.mutator = get_mutator(args.resolver)
+        result = run(resolver)
+    else:
+        resolver, result, _calls = run_synthetic(args)
+
+    resolved, elapsed, current, peak = result
+    print('resolved:   ', resolved)
+    print('nodes:      ', len(resolver.graph.names))
+    print('mutations:  ', resolver.mutator.mutations)
+    print('time, s:    ', round(elapsed, 3))
+    print('peak, MiB:  ', round(peak / 2 ** 20, 2))
+    print('kept, MiB:  ', round(current / 2 ** 20, 2))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,32 +1,413 @@
 # built-in
+import asyncio
+import atexit
 import json
+import os
 import pickle
+import sqlite3
+import zlib
+from collections import OrderedDict
+from logging import getLogger
 from pathlib import Path
-from time import time
-from typing import List
+from tempfile import mkstemp
+from threading import Lock, local
+from time import monotonic, time
+from typing import Any, Dict, Hashable, List, Optional, Tuple
 
 # app
 from .cached_property import cached_property
 from .config import config
+from .tracing import tracer
+
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+logger = getLogger('dephell.cache')
+# mkstemp makes files readable only by the owner, records get usual permissions instead
+_umask = os.umask(0)
+os.umask(_umask)
+
+
+class FilesStorage:
+    """Every cache record is a separated file in the cache directory.
+    """
+    def __init__(self, root: Path):
+        self.root = root
+
+    def get_updated(self, cache) -> Optional[float]:
+        try:
+            return cache.path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+    def load(self, cache) -> Optional[bytes]:
+        try:
+            return cache.path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def dump(self, cache, content: bytes) -> None:
+        cache.path.parent.mkdir(parents=True, exist_ok=True)
+        # write into a temporary file and then replace the record by it,
+        # so other processes never read a partially written record.
+        fd, tmp_path = mkstemp(dir=str(cache.path.parent), prefix=cache.path.name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as stream:
+                stream.write(content)
+            os.chmod(tmp_path, 0o666 & ~_umask)
+            os.replace(tmp_path, str(cache.path))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def flush(self) -> None:
+        pass
+
+    def touch(self, cache) -> None:
+        if cache.path.exists():
+            cache.path.touch()
+
+    def delete(self, cache) -> None:
+        if cache.path.exists():
+            cache.path.unlink()
+
+
+class SQLiteStorage:
+    """All cache records are rows in one SQLite database in the cache directory.
+
+    Writes are buffered and saved by batches, the buffer is flushed
+    when it is full and on the interpreter exit.
+    """
+    fname = 'cache.sqlite3'
+    batch_size = 64
+    exts = ('.bin', '.http', '.json', '.txt')
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.path = root / self.fname
+        self._local = local()   # sqlite connection can't be shared between threads
+        self._lock = Lock()
+        self._pending = dict()  # type: Dict[str, Tuple[bytes, float]]
+
+        is_new = not self.path.exists()
+        if is_new and root.exists():
+            self.migrate()
+        atexit.register(self.flush)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # forked process (see `--branches`) inherits the connection but cannot use it
+        pid, connection = getattr(self._local, 'connection', (None, None))
+        if connection is not None and pid == os.getpid():
+            return connection
+        self.root.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.path), timeout=30)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS cache '
+            '(key TEXT PRIMARY KEY, content BLOB NOT NULL, updated REAL NOT NULL) '
+            'WITHOUT ROWID',
+        )
+        self._local.connection = (os.getpid(), connection)
+        return connection
+
+    def get_updated(self, cache) -> Optional[float]:
+        with self._lock:
+            record = self._pending.get(cache.key)
+        if record is not None:
+            return record[1]
+        cursor = self.connection.execute('SELECT updated FROM cache WHERE key = ?', (cache.key, ))
+        record = cursor.fetchone()
+        if record is None:
+            return None
+        return record[0]
+
+    def load(self, cache) -> Optional[bytes]:
+        with self._lock:
+            record = self._pending.get(cache.key)
+        if record is not None:
+            return record[0]
+        cursor = self.connection.execute('SELECT content FROM cache WHERE key = ?', (cache.key, ))
+        record = cursor.fetchone()
+        if record is None:
+            return None
+        return bytes(record[0])
+
+    def dump(self, cache, content: bytes) -> None:
+        with self._lock:
+            self._pending[cache.key] = (content, time())
+            if len(self._pending) < self.batch_size:
+                return
+        self.flush()
+
+    def touch(self, cache) -> None:
+        with self._lock:
+            if cache.key in self._pending:
+                self._pending[cache.key] = (self._pending[cache.key][0], time())
+                return
+        with self.connection:
+            self.connection.execute('UPDATE cache SET updated = ? WHERE key = ?', (time(), cache.key))
+
+    def delete(self, cache) -> None:
+        with self._lock:
+            self._pending.pop(cache.key, None)
+        with self.connection:
+            self.connection.execute('DELETE FROM cache WHERE key = ?', (cache.key, ))
+
+    def flush(self) -> None:
+        with self._lock:
+            records = [(key, content, updated) for key, (content, updated) in self._pending.items()]
+            self._pending = dict()
+        if not records:
+            return
+        with self.connection:
+            self.connection.executemany('INSERT OR REPLACE INTO cache VALUES (?, ?, ?)', records)
+
+    def migrate(self) -> int:
+        """Move records of the files storage into the database.
+
+        Returns how many records are moved.
+        """
+        records = []
+        paths = []
+        dirs = []
+        for path, dir_names, fnames in os.walk(str(self.root)):
+            # cloned git repository, not cache records
+            if '.git' in dir_names:
+                dir_names.clear()
+                continue
+            dirs.append(path)
+            for fname in fnames:
+                file_path = Path(path, fname)
+                if file_path.suffix not in self.exts:
+                    continue
+                key = file_path.relative_to(self.root).as_posix()
+                # another process is migrating the same cache right now
+                try:
+                    records.append((key, file_path.read_bytes(), file_path.stat().st_mtime))
+                except FileNotFoundError:
+                    continue
+                paths.append(file_path)
+        if not records:
+            return 0
+
+        with self.connection:
+            self.connection.executemany('INSERT OR REPLACE INTO cache VALUES (?, ?, ?)', records)
+        for file_path in paths:
+            try:
+                file_path.unlink()
+            except FileNotFoundError:
+                pass
+        # drop directories that are empty now
+        for path in reversed(dirs[1:]):
+            try:
+                os.rmdir(path)
+            except OSError:
+                pass
+        logger.info('cache migrated', extra=dict(count=len(records), path=str(self.path)))
+        return len(records)
+
+
+STORAGES = dict(
+    files=FilesStorage,
+    sqlite=SQLiteStorage,
+)
+_storages = dict()  # type: Dict[Tuple[str, str], object]
+
+
+def get_storage():
+    key = (config['cache']['backend'], config['cache']['path'])
+    storage = _storages.get(key)
+    if storage is None:
+        storage = STORAGES[key[0]](Path(key[1]))
+        _storages[key] = storage
+    return storage
+
+
+class CacheLock:
+    """Cross-process lock for fetching a cache record.
+
+    Only one process (or coroutine) fetches the record, others wait and then load it
+    from the cache. The lock is held while the record is fetched from the network,
+    so keys are spread over enough lock files to make waiting for an unrelated key rare,
+    but the count of lock files is still limited. Lock files are split by directories,
+    as the cache records are. Different keys still can share the lock file,
+    so don't take a lock while holding another one, it can wait for itself until the timeout.
+    """
+    files = 2 ** 16
+    delay = .05
+
+    def __init__(self, storage, key: str, timeout: float = 120):
+        self.storage = storage
+        number = '{:04x}'.format(zlib.crc32(key.encode()) % self.files)
+        self.path = storage.root / '.locks' / number[:2] / '{}.lock'.format(number[2:])
+        self.timeout = timeout
+        self._stream = None
+
+    async def __aenter__(self) -> 'CacheLock':
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        stream = self.path.open('ab')
+        deadline = monotonic() + self.timeout
+        # polling instead of blocking, so the lock doesn't block the event loop
+        while not self._acquire(stream.fileno()):
+            if monotonic() > deadline:
+                logger.warning('cannot acquire cache lock', extra=dict(path=str(self.path)))
+                stream.close()
+                return self
+            await asyncio.sleep(self.delay)
+        self._stream = stream
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        if self._stream is None:
+            return
+        # make the record visible for other processes before releasing the lock
+        self.storage.flush()
+        self._release(self._stream.fileno())
+        self._stream.close()
+        self._stream = None
+
+    @staticmethod
+    def _acquire(fd: int) -> bool:
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    @staticmethod
+    def _release(fd: int) -> None:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class Memo:
+    """Process-wide LRU of already parsed cache records.
+
+    Record is valid while its update time in the storage is the same.
+    """
+    missed = object()
+
+    def __init__(self, size: int):
+        self.size = size
+        self._records = OrderedDict()  # type: OrderedDict
+        self._lock = Lock()
+
+    def get(self, key: Hashable, updated: float) -> Any:
+        with self._lock:
+            record = self._records.get(key)
+            if record is None or record[0] != updated:
+                tracer.count('memo_miss')
+                return self.missed
+            self._records.move_to_end(key)
+        tracer.count('memo_hit')
+        return record[1]
+
+    def set(self, key: Hashable, updated: float, data) -> None:
+        with self._lock:
+            self._records[key] = (updated, data)
+            self._records.move_to_end(key)
+            while len(self._records) > self.size:
+                self._records.popitem(last=False)
+
+    def drop(self, key: Hashable) -> None:
+        with self._lock:
+            self._records.pop(key, None)
+
+
+memo = Memo(size=1024)
 
 
 class BaseCache:
     ext = ''
+    # parsed record is shared between all loads of it, so it must not be mutated
+    use_memo = True
 
     def __init__(self, *keys, ttl: int = -1):
         self.path = Path(config['cache']['path'], *keys)
         if self.ext:
             self.path = self.path.with_suffix(self.ext)
+        self.key = self.path.relative_to(config['cache']['path']).as_posix()
         self.ttl = ttl
-        self._check_ttl()
+        self.storage = get_storage()
 
-    def _check_ttl(self) -> None:
-        if self.ttl < 0:
-            return
-        if not self.path.exists():
-            return
-        if time() - self.path.stat().st_mtime > self.ttl:
-            self.path.unlink()
+    def load(self):
+        updated = self.storage.get_updated(self)
+        if updated is None or self._is_expired(updated):
+            tracer.count('cache_miss')
+            return None
+        tracer.count('cache_hit')
+        return self._load(updated)
+
+    def load_stale(self):
+        """Load the record even if TTL is expired.
+        """
+        updated = self.storage.get_updated(self)
+        if updated is None:
+            return None
+        return self._load(updated)
+
+    def dump(self, data) -> None:
+        if self.use_memo:
+            memo.drop(self._memo_key)
+        self.storage.dump(self, self._dumps(data))
+
+    def touch(self) -> None:
+        """Reset TTL for the record.
+        """
+        self.storage.touch(self)
+
+    def lock(self, timeout: float = 120) -> CacheLock:
+        """Async context manager to fetch the record only in one process at once.
+        """
+        return CacheLock(storage=self.storage, key=self.key, timeout=timeout)
+
+    def exists(self) -> bool:
+        updated = self.storage.get_updated(self)
+        return updated is not None and not self._is_expired(updated)
+
+    def delete(self) -> None:
+        if self.use_memo:
+            memo.drop(self._memo_key)
+        self.storage.delete(self)
+
+    def _is_expired(self, updated: float) -> bool:
+        # expired record is kept, so it can be revalidated
+        return self.ttl >= 0 and time() - updated > self.ttl
+
+    @property
+    def _memo_key(self) -> tuple:
+        return type(self.storage), type(self), str(self.path)
+
+    def _load(self, updated: float):
+        if self.use_memo:
+            data = memo.get(self._memo_key, updated=updated)
+            if data is not memo.missed:
+                return data
+        content = self.storage.load(self)
+        if content is None:
+            return None
+        data = self._loads(content)
+        if self.use_memo:
+            memo.set(self._memo_key, updated=updated, data=data)
+        return data
+
+    def _loads(self, content: bytes):
+        raise NotImplementedError
+
+    def _dumps(self, data) -> bytes:
+        raise NotImplementedError
 
     def __str__(self):
         return str(self.path)
@@ -37,55 +418,106 @@ class BaseCache:
 
 class BinCache(BaseCache):
     ext = '.bin'
+    use_memo = False
 
-    def load(self):
-        if not self.path.exists():
-            return None
-        with self.path.open('rb') as stream:
-            return pickle.load(stream)
+    def _loads(self, content: bytes):
+        return pickle.loads(content)
 
-    def dump(self, data) -> None:
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        with self.path.open('wb') as stream:
-            pickle.dump(data, stream)
+    def _dumps(self, data) -> bytes:
+        return pickle.dumps(data)
 
 
 class TextCache(BaseCache):
     ext = '.txt'
 
-    def load(self):
-        if not self.path.exists():
-            return None
-        with self.path.open('r') as stream:
-            return stream.read().split('\n')
+    def _loads(self, content: bytes) -> List[str]:
+        return content.decode('utf8').split('\n')
 
-    def dump(self, data: List[str]) -> None:
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        with self.path.open('w') as stream:
-            stream.write('\n'.join(data))
+    def _dumps(self, data: List[str]) -> bytes:
+        return '\n'.join(data).encode('utf8')
 
 
 class JSONCache(BaseCache):
     ext = '.json'
 
+    def _loads(self, content: bytes):
+        try:
+            return json.loads(content.decode('utf8'))
+        except json.JSONDecodeError:
+            return None
+
+    def _dumps(self, data) -> bytes:
+        return json.dumps(data).encode('utf8')
+
+
+class HTTPCache(JSONCache):
+    """Processed HTTP response with validators of the response.
+
+    When TTL is expired, the response can be checked by a conditional request
+    instead of downloading it again.
+    """
+    ext = '.http'
+
     def load(self):
-        if not self.path.exists():
+        record = super().load()
+        if record is None:
             return None
-        with self.path.open('r') as stream:
-            try:
-                return json.load(stream)
-            except json.JSONDecodeError:
-                return None
-        return None
+        return record['data']
 
-    def dump(self, data):
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        with self.path.open('w') as stream:
-            json.dump(data, stream)
+    def dump(self, data, *, headers=None) -> None:
+        if headers is None:
+            headers = dict()
+        super().dump(dict(
+            data=data,
+            etag=headers.get('ETag'),
+            modified=headers.get('Last-Modified'),
+        ))
+
+    def get_headers(self) -> Dict[str, str]:
+        """Headers for a conditional request of the stale record.
+        """
+        record = self.load_stale()
+        headers = dict()
+        if record is None:
+            return headers
+        if record['etag']:
+            headers['If-None-Match'] = record['etag']
+        if record['modified']:
+            headers['If-Modified-Since'] = record['modified']
+        return headers
+
+    def revalidate(self):
+        """Mark the stale record as actual and return it.
+
+        Call it when the server says that the response isn't modified.
+        """
+        record = self.load_stale()
+        if record is None:
+            return None
+        self.touch()
+        tracer.count('cache_revalidated')
+        return record['data']
+
+
+class HTTPBinCache(HTTPCache):
+    """HTTPCache for processed responses that can't be stored in JSON.
+    """
+    ext = '.bin'
+
+    def _loads(self, content: bytes):
+        # the record can be broken or made by the code that pickles other objects
+        try:
+            return pickle.loads(content)
+        except (pickle.UnpicklingError, AttributeError, ImportError, EOFError, ValueError):
+            return None
+
+    def _dumps(self, data) -> bytes:
+        return pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
 
 
 class RequirementsCache(BaseCache):
     ext = '.txt'
+    use_memo = False
 
     @cached_property
     def converter(self):
@@ -93,19 +525,16 @@ class RequirementsCache(BaseCache):
 
         return PIPConverter(lock=False)
 
-    def load(self):
-        if not self.path.exists():
-            return None
-        root = self.converter.load(self.path)
+    def _loads(self, content: bytes):
+        root = self.converter.loads(content=content.decode('utf8'))
         return root.dependencies
 
-    def dump(self, root):
+    def _dumps(self, root) -> bytes:
         from .controllers import Graph
         from .models import Requirement
 
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        self.converter.dump(
-            path=self.path,
+        content = self.converter.dumps(
             project=root,
             reqs=Requirement.from_graph(graph=Graph(root), lock=False),
         )
+        return content.encode('utf8')
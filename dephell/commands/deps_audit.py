@@ -1,4 +1,5 @@
 # built-in
+import asyncio
 from argparse import ArgumentParser
 
 # app
@@ -43,13 +44,20 @@ class DepsAuditCommand(BaseCommand):
             packages = resolver.graph
 
         safety = Safety()
-        data = []
+        vulnerable = []
         for dep in packages:
             release = dep.group.best_release
             vulns = safety.get(name=dep.name, version=release.version)
-            if not vulns:
-                continue
-            releases = dep.repo.get_releases(dep)
+            if vulns:
+                vulnerable.append((dep, release, vulns))
+
+        # fetch releases for all vulnerable deps concurrently
+        coroutines = [dep.repo.fetch_releases(dep) for dep, _release, _vulns in vulnerable]
+        loop = asyncio.get_event_loop()
+        all_releases = loop.run_until_complete(asyncio.gather(*coroutines))
+
+        data = []
+        for (dep, release, vulns), releases in zip(vulnerable, all_releases):
             for vuln in vulns:
                 data.append(dict(
                     # local info
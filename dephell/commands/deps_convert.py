@@ -5,9 +5,9 @@ from pathlib import Path
 # app
 from ..actions import attach_deps
 from ..config import builders
-from ..controllers import analyze_conflict
+from ..controllers import Checkpoint, analyze_conflict
 from ..converters import CONVERTERS
-from ..models import Requirement
+from ..models import Requirement, Target
 from .base import BaseCommand
 
 
@@ -23,6 +23,11 @@ class DepsConvertCommand(BaseCommand):
         builders.build_api(parser)
         builders.build_output(parser)
         builders.build_other(parser)
+        parser.add_argument('--targets', nargs='*', help='Pythons and platforms to lock for, like 3.8-linux.')
+        parser.add_argument('--resume', action='store_true',
+                            help='continue resolving from the checkpoint of the last failed run.')
+        parser.add_argument('--incremental', action='store_true',
+                            help='keep versions from the existing lockfile if they are still compatible.')
         return parser
 
     def __call__(self) -> bool:
@@ -55,8 +60,13 @@ class DepsConvertCommand(BaseCommand):
 
         # resolve (and merge)
         if should_be_resolved:
+            if self.args.incremental:
+                self._attach_pins(resolver=resolver, dumper=dumper)
+            checkpoint = Checkpoint(key=str(Path(self.config['from']['path']).resolve()))
+            if self.args.resume and checkpoint.restore(resolver):
+                self.logger.info('resolving continued from checkpoint')
             self.logger.debug('resolving...')
-            resolved = resolver.resolve(silent=self.config['silent'])
+            resolved = resolver.resolve(silent=self.config['silent'], checkpoint=checkpoint)
             if not resolved:
                 conflict = analyze_conflict(resolver=resolver)
                 self.logger.warning('conflict was found')
@@ -64,6 +74,10 @@ class DepsConvertCommand(BaseCommand):
                 return False
             self.logger.debug('resolved')
 
+            # mark deps by targets where they are required
+            if self.config.get('targets'):
+                resolver.apply_targets([Target.parse(target) for target in self.config['targets']])
+
         # filter out deps by `--envs`
         if self.config.get('envs'):
             if len(resolver.graph._layers) == 1:
@@ -92,3 +106,11 @@ class DepsConvertCommand(BaseCommand):
             dumper.dump(path=self.config['to']['path'], **dumper_kwargs)
         self.logger.info('converted')
         return True
+
+    def _attach_pins(self, resolver, dumper) -> None:
+        path = Path(self.config['to']['path'])
+        if self.config['to']['path'] == 'stdout' or not path.exists():
+            self.logger.warning('lockfile not found, resolve from zero', extra=dict(path=str(path)))
+            return
+        pins = resolver.attach_pins(dumper.load(path))
+        self.logger.debug('locked versions attached', extra=dict(count=pins))
@@ -1,4 +1,5 @@
 # built-in
+import asyncio
 from argparse import ArgumentParser
 
 # app
@@ -24,9 +25,14 @@ class DepsOutdatedCommand(BaseCommand):
         if resolver is None:
             return False
 
+        # fetch releases for all deps concurrently
+        deps = list(resolver.graph)
+        coroutines = [dep.repo.fetch_releases(dep) for dep in deps]
+        loop = asyncio.get_event_loop()
+        all_releases = loop.run_until_complete(asyncio.gather(*coroutines))
+
         data = []
-        for dep in resolver.graph:
-            releases = dep.repo.get_releases(dep)
+        for dep, releases in zip(deps, all_releases):
             latest = str(releases[0].version)
             locked = str(dep.group.best_release.version)
             if latest == locked:
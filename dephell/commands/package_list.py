@@ -1,4 +1,5 @@
 # built-in
+import asyncio
 from argparse import ArgumentParser
 
 # app
@@ -26,13 +27,19 @@ class PackageListCommand(BaseCommand):
         self.logger.debug('choosen python', extra=dict(path=str(python.path)))
         root = InstalledConverter().load(paths=python.lib_paths)
 
+        # fetch releases for all packages concurrently
+        deps = list(root.dependencies)
+        coroutines = [dep.repo.fetch_releases(dep) for dep in deps]
+        loop = asyncio.get_event_loop()
+        all_releases = loop.run_until_complete(asyncio.gather(*coroutines, return_exceptions=True))
+
         data = []
-        for dep in root.dependencies:
-            try:
-                releases = dep.repo.get_releases(dep)
-            except PackageNotFoundError as exc:
-                self.logger.warning(str(exc), extra=exc.extra)
+        for dep, releases in zip(deps, all_releases):
+            if isinstance(releases, PackageNotFoundError):
+                self.logger.warning(str(releases), extra=releases.extra)
                 continue
+            if isinstance(releases, Exception):
+                raise releases
 
             data.append(dict(
                 name=dep.name,
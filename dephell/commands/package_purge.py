@@ -7,7 +7,7 @@ from packaging.utils import canonicalize_name
 # app
 from ..actions import get_python_env
 from ..config import builders
-from ..controllers import Graph, Mutator, Resolver, analyze_conflict
+from ..controllers import Graph, Resolver, analyze_conflict, get_mutator
 from ..converters import InstalledConverter
 from ..models import Requirement
 from ..package_manager import PackageManager
@@ -42,7 +42,7 @@ class PackagePurgeCommand(BaseCommand):
         self.logger.info('build dependencies graph...')
         resolver = Resolver(
             graph=Graph(root),
-            mutator=Mutator(),
+            mutator=get_mutator(),
         )
         resolved = resolver.resolve(silent=self.config['silent'])
         if not resolved:
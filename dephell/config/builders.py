@@ -3,7 +3,9 @@
 from dephell_versioning import get_schemes
 
 # app
-from ..constants import FORMATS, LOG_FORMATTERS, LOG_LEVELS, REPOSITORIES, STRATEGIES
+from ..constants import (
+    CACHE_BACKENDS, FORMATS, LOG_FORMATTERS, LOG_LEVELS, REPOSITORIES, RESOLVERS, STRATEGIES, TRACE_FORMATS
+)
 
 
 env_help = (
@@ -43,6 +45,14 @@ def build_resolver(parser):
     resolver_group.add_argument('--strategy', choices=STRATEGIES, help='Algorithm to select best release.')
     resolver_group.add_argument('--prereleases', action='store_true', help='Allow prereleases')
     resolver_group.add_argument('--mutations', type=int, help='Maximum mutations limit')
+    resolver_group.add_argument('--resolver', choices=RESOLVERS, help='Algorithm to solve conflicts.')
+    resolver_group.add_argument(
+        '--branches', type=int,
+        help='How many mutations for a conflict to try in parallel processes.',
+    )
+    resolver_group.add_argument('--prefetch', type=int, help='How many releases to fetch in background.')
+    resolver_group.add_argument('--trace-path', help='Path to save timings of resolver phases.')
+    resolver_group.add_argument('--trace-format', choices=TRACE_FORMATS, help='Format for resolver timings.')
 
 
 def build_api(parser):
@@ -85,6 +95,7 @@ def build_other(parser):
 
     other_group.add_argument('--cache-path', help='path to dephell cache')
     other_group.add_argument('--cache-ttl', type=int, help='Time to live for releases list cache')
+    other_group.add_argument('--cache-backend', choices=CACHE_BACKENDS, help='how to store dephell cache')
 
     other_group.add_argument('--project', help='path to the current project')
     other_group.add_argument('--bin', help='path to the dir for installing scripts')
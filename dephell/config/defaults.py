@@ -17,6 +17,9 @@ DEFAULT = dict(
     prereleases=False,
     strategy='max',
     mutations=200,
+    resolver='mutator',
+    branches=1,
+    prefetch=8,
 
     # api
     bitbucket='https://api.bitbucket.org/2.0',
@@ -45,6 +48,7 @@ DEFAULT = dict(
     cache=dict(
         path=str(get_cache_dir()),
         ttl=3600,
+        backend='files',
     ),
     bin=str(Path.home() / '.local' / 'bin'),
     project=str(Path('.').resolve()),
@@ -29,7 +29,7 @@ class Config:
     env = ''
     _skip = (
         'config', 'env',
-        'key', 'name', 'type',
+        'key', 'name', 'type', 'resume', 'incremental',
         'hostname', 'username', 'password',
     )
 
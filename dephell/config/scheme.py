@@ -3,7 +3,10 @@
 from dephell_versioning import get_schemes
 
 # app
-from ..constants import FORMATS, LOG_FORMATTERS, LOG_LEVELS, REPOSITORIES, STRATEGIES
+from ..constants import (
+    CACHE_BACKENDS, FORMATS, LOG_FORMATTERS, LOG_LEVELS, REPOSITORIES,
+    RESOLVERS, REX_TARGET, STRATEGIES, TRACE_FORMATS
+)
 
 
 _TARGET = dict(
@@ -58,6 +61,18 @@ SCHEME = {
     'strategy':     dict(type='string', required=True, allowed=STRATEGIES),
     'prereleases':  dict(type='boolean', required=True),
     'mutations':    dict(type='integer', required=True),
+    'resolver':     dict(type='string', required=True, allowed=RESOLVERS),
+    'branches':     dict(type='integer', required=True, min=1),
+    'prefetch':     dict(type='integer', required=True, min=0),
+    'targets':      dict(type='list', required=False, schema=dict(type='string', regex=REX_TARGET)),
+    'trace':        dict(
+        type='dict',
+        required=False,
+        schema={
+            'path': dict(type='string', required=True),
+            'format': dict(type='string', required=False, allowed=TRACE_FORMATS),
+        },
+    ),
 
     # output
     'silent':       dict(type='boolean', required=True),
@@ -101,6 +116,7 @@ SCHEME = {
         schema={
             'path': dict(type='string', required=True),
             'ttl':  dict(type='integer', required=True),
+            'backend': dict(type='string', required=True, allowed=CACHE_BACKENDS),
         },
     ),
     'project':      dict(type='string', required=True),
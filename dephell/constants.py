@@ -63,6 +63,17 @@ PAIRS = (
 )
 
 STRATEGIES = ('min', 'max')
+# python version and optional sys_platform, like `3.8-linux`
+REX_TARGET = r'^[0-9]+\.[0-9]+(-(linux|darwin|win32))?$'
+# python versions to check compatibility of releases with python markers
+PYTHON_VERSIONS = (
+    '2.6', '2.7',
+    '3.0', '3.1', '3.2', '3.3', '3.4', '3.5', '3.6', '3.7', '3.8', '3.9', '3.10',
+    '3.11', '3.12', '3.13', '3.14',
+)
+RESOLVERS = ('mutator', 'backjumper')
+CACHE_BACKENDS = ('files', 'sqlite')
+TRACE_FORMATS = ('json', 'chrome')
 REPOSITORIES = ('pypi', 'conda', 'conda_git', 'conda_cloud')
 
 LOG_LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'EXCEPTION')
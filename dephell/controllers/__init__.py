@@ -1,9 +1,12 @@
 # app
+from ._backjumper import Backjumper
+from ._checkpoint import Checkpoint
 from ._conflict import analyze_conflict
 from ._dependency import DependencyMaker
 from ._docker import DockerContainer, DockerContainers
 from ._graph import Graph
-from ._mutator import Mutator
+from ._mutator import Mutator, get_mutator
+from ._prefetch import Prefetcher
 from ._readme import Readme
 from ._repos import RepositoriesRegistry
 from ._resolver import Resolver
@@ -13,11 +16,15 @@ from ._snyk import Snyk, SnykVulnInfo
 
 __all__ = [
     'analyze_conflict',
+    'Backjumper',
+    'Checkpoint',
     'DependencyMaker',
     'DockerContainer',
     'DockerContainers',
+    'get_mutator',
     'Graph',
     'Mutator',
+    'Prefetcher',
     'Readme',
     'RepositoriesRegistry',
     'Resolver',
@@ -0,0 +1,229 @@
+# built-in
+from logging import getLogger
+from typing import Dict, FrozenSet, Iterable, Optional, Sequence, Set, Tuple
+
+# external
+import attr
+
+# app
+from ..models import Dependency, Group, RootDependency
+from ._graph import Graph
+from ._mutator import Mutator
+
+
+logger = getLogger('dephell.controllers')
+Incompatibility = FrozenSet[Tuple[str, int]]
+
+
+@attr.s()
+class Backjumper(Mutator):
+    """Conflict-driven alternative for Mutator.
+
+    Every conflict is turned into an incompatibility: a set of parents' groups
+    that can't be chosen together because their constraints for the conflicting
+    dependency have no releases in common. Learned incompatibilities are never
+    tried again. Instead of walking through the product of groups of all ancestors,
+    it changes the group of the deepest cause of the conflict first (backjumping),
+    then the group of the deepest ancestor of causes, and falls back
+    to the Mutator's behavior only when nothing of it helps. Incompatibilities
+    are derived without mutations where it's possible: for candidates that
+    keep the conflict, and for parents that force causes into their groups.
+    """
+    _incompatibilities = attr.ib(type=Set[Incompatibility], factory=set, repr=False, init=False)
+
+    @property
+    def learned(self) -> int:
+        return len(self._incompatibilities)
+
+    def get_state(self) -> dict:
+        state = super().get_state()
+        state['incompatibilities'] = [sorted(map(list, item)) for item in self._incompatibilities]
+        return state
+
+    def set_state(self, state: dict) -> None:
+        super().set_state(state)
+        incompatibilities = state.get('incompatibilities', ())
+        self._incompatibilities = {frozenset(map(tuple, item)) for item in incompatibilities}
+
+    def mutate(self, graph: Graph) -> Optional[Tuple[Group, ...]]:
+        if self.mutations >= self.limit:
+            logger.warning('mutations limit reached', extra=dict(limit=self.limit))
+            return None
+
+        incompatibility = self._learn(graph)
+        if not incompatibility:
+            logger.debug('conflict caused only by roots', extra=dict(dep=graph.conflict.name))
+            return None
+
+        causes = [graph.get(name) for name, _ in incompatibility]
+        causes = [dep for dep in causes if dep is not None]
+        # the deepest cause was decided last, so jump back to it first
+        causes.sort(key=lambda dep: (graph.get_layer(dep).level, dep.name), reverse=True)
+        assigned = self._get_assignment(graph)
+        groups = self._jump(deps=causes, assigned=assigned, conflict=graph.conflict)
+
+        # no cause can be changed, so let's try to change constraints for causes
+        if groups is None:
+            self._learn_from_parents(graph=graph, causes=causes)
+            names = {dep.name for dep in causes}
+            ancestors = graph.get_parents(*causes).values()
+            ancestors = [dep for dep in ancestors if dep.name not in names]
+            ancestors.sort(key=lambda dep: (graph.get_layer(dep).level, dep.name), reverse=True)
+            assigned = self._get_assignment(graph)
+            assigned = {name: number for name, number in assigned.items() if name not in names}
+            groups = self._jump_alone(graph=graph, deps=ancestors, assigned=assigned)
+
+        # nothing is found, let's try all combinations as Mutator does
+        if groups is None:
+            return super().mutate(graph)
+
+        self.accept(groups)
+        return groups
+
+    # private methods
+
+    def _learn(self, graph: Graph) -> Incompatibility:
+        roots = {root.name for root in graph.get_layer(0)}
+        incompatibility = frozenset(
+            (name, number)
+            for name, number in graph.conflict.constraint._groups.items()
+            if name not in roots
+        )
+        if incompatibility and incompatibility not in self._incompatibilities:
+            logger.debug('learned incompatibility', extra=dict(
+                dep=graph.conflict.name,
+                groups=sorted('{}|{}'.format(*term) for term in incompatibility),
+            ))
+            self._incompatibilities.add(incompatibility)
+        return incompatibility
+
+    def _learn_from_parents(self, graph: Graph, causes: Sequence[Dependency]) -> None:
+        """Learn groups of direct parents that force causes into the learned incompatibility.
+        """
+        names = {dep.name for dep in causes}
+        distances = graph.get_distances(*causes)
+        terms = set()
+        for name, distance in distances.items():
+            if distance != 1 or name in names:
+                continue
+            dep = graph.get(name)
+            # roots can't be changed, so they aren't a part of incompatibility
+            if dep is None or isinstance(dep, RootDependency):
+                continue
+            current = self._get_current(dep)
+            if current is None:
+                return
+            terms.add((name, current.number))
+        incompatibility = frozenset(terms)
+        if incompatibility and incompatibility not in self._incompatibilities:
+            logger.debug('learned incompatibility from parents', extra=dict(
+                deps=sorted(names),
+                groups=sorted('{}|{}'.format(*term) for term in incompatibility),
+            ))
+            self._incompatibilities.add(incompatibility)
+
+    def _get_assignment(self, graph: Graph) -> Dict[str, int]:
+        """Numbers of locked groups for all deps mentioned in incompatibilities.
+        """
+        names = {name for incompatibility in self._incompatibilities for name, _ in incompatibility}
+        assigned = dict()
+        for name in names:
+            dep = graph.get(name)
+            if dep is not None and dep.locked:
+                assigned[name] = dep.group.number
+        return assigned
+
+    def _jump(self, deps: Sequence[Dependency], assigned: Dict[str, int],
+              conflict: Dependency) -> Optional[Tuple[Group, ...]]:
+        deps = [dep for dep in deps if not isinstance(dep, RootDependency)]
+        current = [self._get_current(dep) for dep in deps]
+        if None in current:
+            return None
+        for index, dep in enumerate(deps):
+            for group in dep.groups:
+                if group.empty or group.number == current[index].number:
+                    continue
+                groups = tuple(current[:index]) + (group, ) + tuple(current[index + 1:])
+                if not self._check_candidate(groups=groups, assigned=assigned):
+                    continue
+                # the conflict is known before the mutation, so learn it for free
+                if not self._is_satisfiable(groups=groups, conflict=conflict):
+                    self._incompatibilities.add(self._make_snapshot(groups))
+                    continue
+                return groups
+        return None
+
+    def _jump_alone(self, graph: Graph, deps: Sequence[Dependency],
+                    assigned: Dict[str, int]) -> Optional[Tuple[Group, ...]]:
+        """Change group only for one dependency and let the resolver choose groups for its children.
+        """
+        for dep in deps:
+            if isinstance(dep, RootDependency):
+                continue
+            current = self._get_current(dep)
+            if current is None:
+                continue
+            children = {name for name in assigned if dep.name in graph.get_parents(graph.get(name))}
+            for group in dep.groups:
+                if group.empty or group.number == current.number:
+                    continue
+                predicted = self._predict(
+                    dep=dep, group=group, children=children,
+                    graph=graph, assigned=assigned,
+                )
+                if self._check_candidate(groups=(group, ), assigned=predicted):
+                    return (group, )
+        return None
+
+    @staticmethod
+    def _predict(dep: Dependency, group: Group, children: Set[str], graph: Graph,
+                 assigned: Dict[str, int]) -> Dict[str, int]:
+        """Assignment that will be in the graph after changing the group of dep.
+
+        Children of the dep can get other groups or leave the graph after the change.
+        The only exception is direct children that are still required by the new group
+        and have only one group, so they will get the same group again.
+        """
+        names = {subdep.name for subdep in dep.get_dependencies(group)}
+        predicted = dict()
+        for name, number in assigned.items():
+            if name not in children:
+                predicted[name] = number
+            elif name in names and len(list(graph.get(name).groups)) == 1:
+                predicted[name] = number
+        return predicted
+
+    @staticmethod
+    def _is_satisfiable(groups: Iterable[Group], conflict: Dependency) -> bool:
+        """Check that the conflicting dependency has releases for the new groups of causes.
+        """
+        constraint = conflict.constraint.copy()
+        subconstraints = []
+        for group in groups:
+            constraint.unapply(group.name)
+            if group.dep is None:
+                return True
+            for subdep in group.dep.get_dependencies(group):
+                if subdep.name == conflict.name:
+                    subconstraints.append(subdep.constraint)
+        for subconstraint in subconstraints:
+            constraint &= subconstraint
+        return bool(constraint.filter(conflict.groups.releases))
+
+    def _check_soft(self, groups: Sequence[Group], deps: Sequence[Dependency],
+                    conflict: Dependency) -> bool:
+        # used by Mutator's checkers, so fallback respects learned incompatibilities too
+        return self._check_candidate(groups=groups, assigned=dict())
+
+    def _check_candidate(self, groups: Iterable[Group], assigned: Dict[str, int]) -> bool:
+        if self._make_snapshot(groups) in self._snapshots:
+            return False
+        assigned = dict(assigned)
+        assigned.update((group.name, group.number) for group in groups)
+        for incompatibility in self._incompatibilities:
+            for name, number in incompatibility:
+                if assigned.get(name) != number:
+                    break
+            else:
+                return False
+        return True
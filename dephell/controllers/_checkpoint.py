@@ -0,0 +1,134 @@
+# built-in
+from hashlib import sha256
+from logging import getLogger
+from typing import Optional
+
+# external
+import attr
+
+# app
+from ..cache import JSONCache
+from ..cached_property import cached_property
+from ..models import Dependency, Group
+
+
+logger = getLogger('dephell.resolver')
+
+
+@attr.s()
+class Checkpoint:
+    """Resolver state saved into the cache directory.
+
+    It keeps the mutator state and, layer by layer, applied flags and chosen
+    groups of deps. Deps themselves aren't saved. Instead, `restore` applies
+    deps again in the same order and with the same groups. Releases are
+    already in the repos cache, so it is much faster than resolving from zero.
+    """
+    key = attr.ib(type=str)
+
+    version = 1
+
+    @cached_property
+    def cache(self) -> JSONCache:
+        name = sha256(self.key.encode()).hexdigest()[:16]
+        return JSONCache('checkpoints', name)
+
+    @staticmethod
+    def _get_roots(graph) -> list:
+        """Root requirements. Checkpoint is valid only for the same roots.
+        """
+        return sorted(str(dep) for root in graph._roots for dep in root.dependencies)
+
+    @staticmethod
+    def _get_group(dep: Dependency, number: int) -> Optional[Group]:
+        if number == dep.groups.pinned_number:
+            if dep.pin is None:
+                return None
+            return dep.groups.get_pinned(dep.pin)
+        for group in dep.groups:
+            if group.number == number:
+                return group
+        return None
+
+    @classmethod
+    def make_state(cls, resolver) -> dict:
+        """Get resolver state as JSON-serializable dict.
+        """
+        layers = []
+        for layer in resolver.graph._layers[1:]:
+            deps = []
+            for dep in layer:
+                deps.append(dict(
+                    name=dep.name,
+                    applied=dep.applied,
+                    group=dep.group.number if dep.locked else None,
+                ))
+            layers.append(dict(level=layer.level, deps=deps))
+
+        return dict(
+            version=cls.version,
+            roots=cls._get_roots(resolver.graph),
+            layers=layers,
+            mutator=resolver.mutator.get_state(),
+        )
+
+    @classmethod
+    def apply_state(cls, resolver, state: dict) -> None:
+        """Apply deps from the state to the graph that has only roots.
+
+        Replay stops on the first conflict, and resolving continues from there.
+        """
+        graph = resolver.graph
+        resolver.mutator.set_state(state['mutator'])
+        for root in graph.get_layer(0):
+            if not root.applied and resolver.apply(root) is not None:
+                return
+
+        for layer in state['layers']:
+            for info in layer['deps']:
+                dep = graph.get(info['name'])
+                if dep is None:
+                    continue
+                if info['group'] is not None and not dep.locked:
+                    group = cls._get_group(dep, info['group'])
+                    if group is None or group.empty:
+                        continue
+                    dep.group = group
+                if not info['applied'] or dep.applied:
+                    continue
+                conflict = resolver.apply(dep)
+                if conflict is not None:
+                    logger.debug('conflict on restoring', extra=dict(dep=dep.name, conflict=conflict.name))
+                    resolver.unapply(dep)
+                    return
+
+    def dump(self, resolver) -> None:
+        self.cache.dump(self.make_state(resolver))
+        logger.info('checkpoint saved', extra=dict(path=str(self.cache)))
+
+    def restore(self, resolver) -> bool:
+        """Apply deps from the checkpoint.
+
+        Returns False if there is no checkpoint for the given roots.
+        """
+        state = self.cache.load()
+        if not state:
+            return False
+        if state.get('version') != self.version:
+            logger.warning('unsupported checkpoint version, ignored', extra=dict(path=str(self.cache)))
+            return False
+        if state['roots'] != self._get_roots(resolver.graph):
+            logger.warning('checkpoint is made for other requirements, ignored', extra=dict(
+                path=str(self.cache),
+            ))
+            return False
+
+        self.apply_state(resolver, state)
+        logger.info('checkpoint restored', extra=dict(
+            path=str(self.cache),
+            mutations=resolver.mutator.mutations,
+        ))
+        return True
+
+    def clear(self) -> None:
+        self.cache.delete()
@@ -30,13 +30,13 @@ class DependencyMaker:
 
     @classmethod
     def from_requirement(cls, source, req, *, url=None, envs=None, marker: Union[Markers, str] = None,
-                         editable=False) -> List[Union[Dependency, ExtraDependency]]:
+                         editable=False, group=None) -> List[Union[Dependency, ExtraDependency]]:
         if type(req) is str:
             req = PackagingRequirement(req)
         # https://github.com/pypa/packaging/blob/master/packaging/requirements.py
         link = parse_link(url or req.url)
         # make constraint
-        constraint = Constraint(source, req.specifier)
+        constraint = Constraint(source, req.specifier, group=group)
         if isinstance(link, VCSLink) and link.rev:
             constraint._specs[source.name] = GitSpecifier()
 
@@ -1,7 +1,8 @@
 # built-in
-from collections import ChainMap
+from collections import ChainMap, defaultdict
+from itertools import count
 from logging import getLogger
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Tuple
 
 # app
 from ..imports import lazy_import
@@ -87,6 +88,17 @@ class Graph:
     def reset(self) -> None:
         self._layers = [Layer(0, *self._roots)]
         self._deps = ChainMap(*[layer._mapping for layer in self._layers])
+        # name -> level of layer where the dep is placed
+        self._levels = {name: 0 for name in self._layers[0]._mapping}
+        # reverse edges index: child name -> names of parents (ordered, values are unused)
+        self._parents = defaultdict(dict)
+        # forward edges index: parent name -> names of children
+        self._children = defaultdict(set)
+        # names of deps that were added or unapplied since the last `get_leafs` call
+        self._dirty = dict.fromkeys(self._levels)
+        # name -> number of adding, it is the order of deps in their layers
+        self._counter = count()
+        self._order = {name: next(self._counter) for name in self._levels}
         self.conflict = None
 
     def clear(self) -> None:
@@ -94,11 +106,45 @@ class Graph:
         """
         for layer in self._layers[1:]:
             layer.clear()
+        for name in tuple(self._levels):
+            if name not in self._deps:
+                del self._levels[name]
+                del self._order[name]
+        for name in tuple(self._children):
+            if name not in self._deps:
+                self.connect(name)
+
+    def connect(self, parent, *children) -> None:
+        """Replace all known children of the parent by the given ones.
+
+        Edges describe the group that was chosen for the parent, not the applied state.
+        So, parent that was unapplied because of conflict is still a parent of
+        the conflicting dependency, and mutator can find it.
+        """
+        if not isinstance(parent, str):
+            parent = parent.name
+        for name in self._children.pop(parent, ()):
+            self._parents[name].pop(parent, None)
+        for child in children:
+            self.link(parent, child)
+
+    def link(self, parent, child) -> None:
+        """Add one edge from parent to child into the index.
+        """
+        if not isinstance(parent, str):
+            parent = parent.name
+        if not isinstance(child, str):
+            child = child.name
+        self._children[parent].add(child)
+        self._parents[child][parent] = None
 
     def add(self, dep, *, level: Optional[int] = None) -> None:
         if isinstance(dep, RootDependency):
             self._layers[0].add(dep)
             self._roots.append(dep)
+            self._levels[dep.name] = 0
+            self._order.setdefault(dep.name, next(self._counter))
+            self.touch(dep)
             return
 
         if level is not None:
@@ -108,39 +154,71 @@ class Graph:
                 layer = Layer(level, dep)
                 self._layers.append(layer)
                 self._deps = self._deps.new_child(layer._mapping)
+            if dep.name not in self._levels:
+                self._order[dep.name] = next(self._counter)
+            self._levels[dep.name] = level
+            self.touch(dep)
+            for parent_name in dep.constraint.sources:
+                self.link(parent_name, dep)
             return
 
-        parents_names = dep.constraint.sources
-        for layer in self._layers:
-            for parent in layer:
-                if parent.name in parents_names:
-                    return self.add(dep, level=layer.level + 1)
-        raise KeyError('cannot find any parent for dependency: ' + str(dep.name))
+        # place dep right after the highest layer with any of its parents
+        levels = [self._levels[name] for name in dep.constraint.sources if name in self._levels]
+        if not levels:
+            raise KeyError('cannot find any parent for dependency: ' + str(dep.name))
+        return self.add(dep, level=min(levels) + 1)
+
+    def remove(self, dep) -> None:
+        """Drop dependency from the graph with all its edges.
+        """
+        name = dep if isinstance(dep, str) else dep.name
+        del self.get_layer(name)[name]
+        del self._levels[name]
+        del self._order[name]
+        self._dirty.pop(name, None)
+        self.connect(name)
+        for parent in self._parents.pop(name, ()):
+            self._children[parent].discard(name)
+
+    def touch(self, dep) -> None:
+        """Mark dependency as changed, so `get_leafs` checks it again.
+
+        Call it every time when dep gets not applied or starts to be used.
+        """
+        name = dep if isinstance(dep, str) else dep.name
+        self._dirty[name] = None
 
     def get_leafs(self, level: Optional[int] = None) -> tuple:
         """Get deps that isn't applied yet
-        """
-        layers = self._layers
-        if level is not None:
-            layers = layers[:level + 1]
 
+        Only deps that were touched since the previous call are checked,
+        so every resolver iteration costs as much as deps were changed.
+        """
         result = []
-        for layer in layers:
-            for dep in layer:
-                if not dep.applied and dep.used:
-                    result.append(dep)
+        dirty = dict()
+        for name in self._dirty:
+            dep = self._deps.get(name)
+            if dep is None or dep.applied or not dep.used:
+                continue
+            dirty[name] = None
+            if level is None or self._levels[name] <= level:
+                result.append(dep)
+        self._dirty = dirty
+        # the same order as layers have
+        result.sort(key=lambda dep: (self._levels[dep.name], self._order[dep.name]))
         return tuple(result)
 
     def get_layer(self, dep_or_level) -> Layer:
         if isinstance(dep_or_level, int):
             return self._layers[dep_or_level]
 
-        dep = dep_or_level
-        for layer in reversed(self._layers):
-            if dep in layer:
-                return layer
-
-        raise KeyError('cannot find dep')
+        name = dep_or_level
+        if not isinstance(name, str):
+            name = name.name
+        level = self._levels.get(name)
+        if level is None:
+            raise KeyError('cannot find dep')
+        return self._layers[level]
 
     def get(self, name: str):
         if name in self._deps:
@@ -168,31 +246,44 @@ class Graph:
         return result
 
     def get_parents(self, *deps, avoid: Optional[list] = None) -> dict:
-        if avoid is None:
-            avoid = []
+        """Get all ancestors of dependencies that represented in graph.
 
+        It uses edges index, so it doesn't touch (and lock) `dependencies` of nodes.
+        """
         parents = dict()
-        for dep in deps:
-            for layer in self._layers:
-                for parent in layer:
-                    was_locked = parent.locked
-                    for children in parent.dependencies:
-                        if children.name != dep.name:
-                            continue
-                        if children.name in avoid:
-                            continue
-                        parents[parent.name] = parent
-                        break
-                    # if dependency hasn't been locked then unlock it after our accidental lock
-                    if parent.locked and not was_locked:
-                        parent.unlock()
-        if parents:
-            parents.update(self.get_parents(
-                *parents.values(),
-                avoid=avoid + [dep.name for dep in deps],
-            ))
+        for parent, _distance in self._iter_ancestors(*deps, avoid=avoid):
+            parents.setdefault(parent.name, parent)
         return parents
 
+    def get_distances(self, *deps, avoid: Optional[list] = None) -> Dict[str, int]:
+        """Get the shortest distance from every ancestor to the given dependencies.
+        """
+        distances = dict()
+        for parent, distance in self._iter_ancestors(*deps, avoid=avoid):
+            distances.setdefault(parent.name, distance)
+        return distances
+
+    def _iter_ancestors(self, *deps, avoid: Optional[list] = None) -> Iterator[Tuple[Any, int]]:
+        """Breadth-first walk over reverse edges. Yields (parent, distance) pairs.
+        """
+        visited = set(avoid or ())
+        names = [dep.name for dep in deps]
+        distance = 1
+        while names:
+            next_names = []
+            for name in names:
+                if name in visited:
+                    continue
+                visited.add(name)
+                for parent_name in self._parents.get(name, ()):
+                    parent = self._deps.get(parent_name)
+                    if parent is None:
+                        continue
+                    yield parent, distance
+                    next_names.append(parent_name)
+            names = next_names
+            distance += 1
+
     def draw(self, path: str = '.dephell_report', suffix: str = '') -> None:
         dot = graphviz.Digraph(
             name=self._roots[0].name + suffix,
@@ -1,7 +1,9 @@
 # built-in
+import heapq
 from itertools import product
 from logging import getLogger
-from typing import Iterable, Iterator, Optional, Sequence, Set, Tuple
+from operator import itemgetter
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 # external
 import attr
@@ -9,11 +11,11 @@ import attr
 # app
 from ..config import config
 from ..models import Dependency, Group, RootDependency
-from ._dependency import DependencyMaker
 from ._graph import Graph
 
 
 logger = getLogger('dephell.controllers')
+Snapshot = FrozenSet[Tuple[str, int]]
 
 
 def lazy_product(*all_groups):
@@ -43,7 +45,11 @@ def lazy_product(*all_groups):
 class Mutator:
     limit = attr.ib(type=int, factory=lambda: config['mutations'])
     mutations = attr.ib(type=int, default=0, init=False)
-    _snapshots = attr.ib(type=Set[Tuple[str, ...]], factory=set, repr=False, init=False)
+    decisions = attr.ib(type=int, default=0, init=False)
+    _snapshots = attr.ib(type=Set[Snapshot], factory=set, repr=False, init=False)
+
+    # how many candidates to compare after the first one from the best tier is found
+    window = 64
 
     def mutate(self, graph: Graph) -> Optional[Tuple[Group, ...]]:
         """Get graph with conflict and mutate one dependency.
@@ -56,19 +62,27 @@ class Mutator:
             return None
 
         parents = tuple(graph.get_parents(graph.conflict).values())
-        checker = (
-            self._check_in_conflict,
-            self._check_in_subgraph,
-            self._check_not_empty,
-            # self._check_soft,
-        )
-        for check in checker:
-            for groups in self.get_mutations(deps=parents):
-                if check(groups=groups, deps=parents, conflict=graph.conflict):
-                    self.remember(groups)
-                    self.mutations += 1
-                    return groups
-        return None  # mypy wants it
+        groups = self._choose(graph=graph, deps=parents, conflict=graph.conflict)
+        if groups is None:
+            return None
+        self.accept(groups)
+        return groups
+
+    def get_candidates(self, graph: Graph, count: int) -> List[Tuple[Group, ...]]:
+        """Get the best mutations for the conflict without applying any of them.
+        """
+        if self.mutations >= self.limit:
+            return []
+        parents = tuple(graph.get_parents(graph.conflict).values())
+        ranked = self._rank(graph=graph, deps=parents, conflict=graph.conflict)
+        return [groups for _key, groups in heapq.nsmallest(count, ranked, key=itemgetter(0))]
+
+    def accept(self, groups: Tuple[Group, ...]) -> None:
+        """Count the mutation as done and never try it again.
+        """
+        self.remember(groups)
+        self.mutations += 1
+        self.decisions += self._count_changes(groups)
 
     def get_mutations(self, deps: Iterable[Dependency]) -> Iterator[Tuple[Group, ...]]:
         all_groups = []
@@ -78,64 +92,147 @@ class Mutator:
             yield groups
 
     @staticmethod
-    def _make_snapshot(groups: Iterable[Group]) -> Tuple[str, ...]:
-        snapshot = sorted(group.name + '|' + str(group.number) for group in groups)
-        return tuple(snapshot)
+    def _get_current(dep: Dependency) -> Optional[Group]:
+        """Get the group that dep has or will get on the next locking.
+
+        It doesn't lock the dependency.
+        """
+        if dep.locked:
+            return dep.group
+        for group in dep.groups:
+            if not group.empty:
+                return group
+        return None
+
+    @classmethod
+    def _count_changes(cls, groups: Iterable[Group]) -> int:
+        """How many deps will get a new group from this mutation.
+        """
+        changes = 0
+        for group in groups:
+            if group.dep is None or isinstance(group.dep, RootDependency):
+                continue
+            current = cls._get_current(group.dep)
+            if current is None or current.number != group.number:
+                changes += 1
+        return changes
+
+    @staticmethod
+    def _make_snapshot(groups: Iterable[Group]) -> Snapshot:
+        return frozenset((group.name, group.number) for group in groups)
 
     def _check_soft(self, groups: Sequence[Group], deps: Sequence[Dependency],
                     conflict: Dependency) -> bool:
         return self._make_snapshot(groups) not in self._snapshots
 
-    def _check_not_empty(self, groups: Sequence[Group], deps: Sequence[Dependency],
-                         conflict: Dependency) -> bool:
-        for group in groups:
-            if group.empty:
-                return False
-        return self._check_soft(groups=groups, deps=deps, conflict=conflict)
-
-    def _check_in_subgraph(self, groups: Sequence[Group], deps: Sequence[Dependency],
-                           conflict: Dependency) -> bool:
-        if not self._check_not_empty(groups=groups, deps=deps, conflict=conflict):
-            return False
-        # any new group has to change state of the subgraph
-        state = {dep.name: dict(dep.constraint.specs) for dep in deps if not isinstance(dep, RootDependency)}
-        state[conflict.name] = dict(conflict.constraint.specs)
-        for group, dep in zip(groups, deps):
-            for subdep in group.dependencies:
-                if isinstance(subdep, Dependency):
-                    if subdep.name not in state:
-                        continue
-                    if dep.name not in state[subdep.name]:
-                        return True
-                    if state[subdep.name][dep.name] != str(subdep.constraint):
-                        return True
-                    continue
+    def _choose(self, graph: Graph, deps: Sequence[Dependency],
+                conflict: Dependency) -> Optional[Tuple[Group, ...]]:
+        best = min(self._rank(graph=graph, deps=deps, conflict=conflict), key=itemgetter(0), default=None)
+        if best is None:
+            return None
+        return best[1]
 
-                for subdep in DependencyMaker.from_requirement(dep, subdep):
-                    if subdep.name not in state:
-                        continue
-                    if dep.name not in state[subdep.name]:
-                        return True
-                    if state[subdep.name][dep.name] != str(subdep.constraint):
-                        return True
-        return False
-
-    def _check_in_conflict(self, groups: Sequence[Group], deps: Sequence[Dependency],
-                           conflict: Dependency) -> bool:
-        if not self._check_not_empty(groups=groups, deps=deps, conflict=conflict):
-            return False
+    def _rank(self, graph: Graph, deps: Sequence[Dependency],
+              conflict: Dependency) -> Iterator[Tuple[tuple, Tuple[Group, ...]]]:
+        """Enumerate candidates once and yield them with keys to rank by.
+
+        Candidates are split into tiers:
+
+        1. Any group depends on the conflicting dependency.
+        2. Any group changes constraints in the subgraph.
+        3. Any other non-empty group.
+
+        Inside of the tier, candidates are ranked by the distance from
+        changed deps to the conflict, by how old changed groups are,
+        and by how many constraints they change.
+        """
+        distances = graph.get_distances(conflict)
+        current = {dep.name: self._get_current(dep) for dep in deps}
         state = {dep.name: dict(dep.constraint.specs) for dep in deps if not isinstance(dep, RootDependency)}
         state[conflict.name] = dict(conflict.constraint.specs)
-        for group, dep in zip(groups, deps):
-            for subdep in group.dependencies:
-                if isinstance(subdep, Dependency):
-                    if subdep.name == conflict.name:
-                        return True
+        stats = dict()  # type: Dict[Tuple[str, int], Tuple[bool, int]]
+
+        found_at = None
+        for index, groups in enumerate(self.get_mutations(deps=deps)):
+            if found_at is not None and index - found_at > self.window:
+                break
+            if any(group.empty for group in groups):
+                continue
+            if not self._check_soft(groups=groups, deps=deps, conflict=conflict):
+                continue
+
+            touches = False
+            changed = changes = distance = age = 0
+            for group, dep in zip(groups, deps):
+                key = (dep.name, group.number)
+                if key not in stats:
+                    stats[key] = self._analyze(group=group, dep=dep, conflict=conflict, state=state)
+                touches = touches or stats[key][0]
+                old = current[dep.name]
+                if old is not None and old.number == group.number:
                     continue
-                for subdep in DependencyMaker.from_requirement(dep, subdep):
-                    if subdep.name == conflict.name:
-                        return True
-        return False
+                changed += 1
+                changes += stats[key][1]
+                distance += distances.get(dep.name, 0)
+                age += group.number
+
+            if touches:
+                tier = 1
+            elif changes:
+                tier = 2
+            else:
+                tier = 3
+            # candidate that changes nothing will lead to the same conflict
+            yield (tier, not changed, distance, age, -changes, index), groups
+            if tier == 1 and found_at is None:
+                found_at = index
+
+    @staticmethod
+    def _analyze(group: Group, dep: Dependency, conflict: Dependency, state: dict) -> Tuple[bool, int]:
+        """Check once per conflict for every group.
+
+        Returns is the conflicting dependency in deps of the group
+        and how many constraints in the subgraph the group changes.
+        """
+        touches = False
+        changes = 0
+        if isinstance(dep, RootDependency):
+            subdeps = group.dependencies
+        else:
+            subdeps = dep.get_dependencies(group)
+        for subdep in subdeps:
+            if subdep.name == conflict.name:
+                touches = True
+            if subdep.name not in state:
+                continue
+            if state[subdep.name].get(dep.name) != str(subdep.constraint):
+                changes += 1
+        return touches, changes
 
     def remember(self, groups: Iterable[Group]) -> None:
         self._snapshots.add(self._make_snapshot(groups))
+
+    def get_state(self) -> dict:
+        """Counters and tried mutations as JSON-serializable dict.
+        """
+        return dict(
+            mutations=self.mutations,
+            decisions=self.decisions,
+            snapshots=[sorted(map(list, snapshot)) for snapshot in self._snapshots],
+        )
+
+    def set_state(self, state: dict) -> None:
+        self.mutations = state['mutations']
+        self.decisions = state['decisions']
+        self._snapshots = {frozenset(map(tuple, snapshot)) for snapshot in state['snapshots']}
+
+
+def get_mutator(name: Optional[str] = None) -> Mutator:
+    """Get conflicts solver by name from the `resolver` config option.
+    """
+    if name is None:
+        name = config['resolver']
+    if name == 'backjumper':
+        from ._backjumper import Backjumper
+        return Backjumper()
+    return Mutator()
@@ -0,0 +1,107 @@
+# built-in
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+from typing import Iterable, List, Optional
+
+# app
+from ..config import config
+from ..models import Dependency
+from ..repositories import GitRepo, LocalRepo
+from ..tracing import tracer
+
+
+logger = getLogger('dephell.resolver')
+
+
+class Prefetcher:
+    """Fetch releases of new deps in background threads.
+
+    Resolver applies deps one by one, and every new dep blocks it on getting
+    releases list and dependencies of the best release from the network.
+    Prefetcher fetches it for the whole batch of new deps at once,
+    so the resolver later gets these data from the repositories cache.
+    Results aren't attached to deps, so fetching can't change resolving.
+    """
+
+    def __init__(self, limit: Optional[int] = None):
+        # max count of simultaneous requests, 0 disables prefetching
+        self.limit = config['prefetch'] if limit is None else limit
+        self._executor = None   # type: Optional[ThreadPoolExecutor]
+        self._futures = []      # type: List
+        self._scheduled = set()
+
+    def schedule(self, deps: Iterable[Dependency], pins: Optional[dict] = None) -> int:
+        """Start fetching releases for deps which releases aren't loaded yet.
+
+        pins -- versions from the existing lockfile, the resolver will choose them.
+        Returns how many deps are scheduled.
+        """
+        if not self.limit:
+            return 0
+        count = 0
+        for dep in deps:
+            if dep.name in self._scheduled:
+                continue
+            self._scheduled.add(dep.name)
+            # git and local repos can't be safely fetched in parallel
+            if dep.repo is None or isinstance(dep.repo, (GitRepo, LocalRepo)):
+                continue
+            if 'groups' in dep.__dict__ and 'releases' in dep.groups.__dict__:
+                continue
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.limit)
+            # repo can update dep by fetched info, so give it a copy
+            dep = dep.copy()
+            if pins:
+                dep.pin = pins.get(dep.base_name)
+            self._futures.append(self._executor.submit(self._fetch, dep))
+            count += 1
+        self._futures = [future for future in self._futures if not future.done()]
+        tracer.count('prefetch', count)
+        return count
+
+    def close(self) -> None:
+        """Drop not started tasks and wait for running ones.
+        """
+        if self._executor is None:
+            return
+        for future in self._futures:
+            future.cancel()
+        self._executor.shutdown(wait=True)
+        self._executor = None
+        self._futures = []
+
+    @staticmethod
+    def _fetch(dep: Dependency) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            releases = dep.repo.get_releases(dep)
+            release = Prefetcher._get_best_release(dep, releases)
+            if release is None:
+                return
+            loop.run_until_complete(dep.repo.get_dependencies(
+                name=release.name,
+                version=release.version,
+                extra=dep.extra,
+            ))
+        except Exception:
+            # the resolver will get the same error and report it
+            logger.debug('cannot prefetch', extra=dict(dep=dep.name), exc_info=True)
+        finally:
+            loop.close()
+
+    @staticmethod
+    def _get_best_release(dep: Dependency, releases):
+        """Release that is the most likely to be chosen for the dep.
+        """
+        if dep.pin is not None:
+            for release in releases:
+                if release.version == dep.pin:
+                    return release
+        releases = dep.constraint.filter(releases)
+        if not releases:
+            return None
+        strategy = max if config['strategy'] == 'max' else min
+        return strategy(releases)
@@ -131,11 +131,11 @@ class RepositoriesRegistry(WarehouseBaseRepo):
                 repos.append(repo)
         return type(self)(repos=repos, prereleases=self.prereleases)
 
-    def get_releases(self, dep) -> tuple:
+    async def fetch_releases(self, dep) -> tuple:
         first_exception = None
         for repo in self.repos:
             try:
-                return repo.get_releases(dep=dep)
+                return await repo.fetch_releases(dep=dep)
             except PackageNotFoundError as exc:
                 if first_exception is None:
                     first_exception = exc
@@ -1,16 +1,25 @@
 # built-in
+import asyncio
+import multiprocessing
 import re
 from logging import getLogger
-from typing import Optional
+from queue import Empty
+from typing import Dict, FrozenSet, Optional, Sequence
 
 # external
 from packaging.markers import Marker
+from packaging.version import InvalidVersion, Version
 from yaspin import yaspin
 
 # app
+from ..cache import get_storage
+from ..config import config
 from ..context_tools import nullcontext
-from ..models import RootDependency
+from ..models import RootDependency, Target
+from ..tracing import tracer
+from ._checkpoint import Checkpoint
 from ._conflict import analyze_conflict
+from ._prefetch import Prefetcher
 
 
 logger = getLogger('dephell.resolver')
@@ -21,16 +30,49 @@ class Resolver:
     def __init__(self, graph, mutator):
         self.graph = graph
         self.mutator = mutator
+        # how many mutations for a conflict to try in parallel
+        self.branches = config['branches']
+        # name -> version from the existing lockfile
+        self.pins = dict()
+        # fetches releases of new deps in background
+        self.prefetcher = Prefetcher()
+
+    def attach_pins(self, root: RootDependency) -> int:
+        """Prefer versions locked in the given root for deps that will be added in the graph.
+
+        Deps which locked version doesn't fit new constraints are resolved
+        as usual, as well as deps that mutator changes on conflicts.
+        Returns how many pins are attached.
+        """
+        for dep in root.dependencies:
+            spec = str(dep.constraint)
+            if not spec.startswith('==') or ',' in spec or '||' in spec:
+                continue
+            try:
+                self.pins[dep.base_name] = Version(spec[2:])
+            except InvalidVersion:
+                continue
+        return len(self.pins)
 
     def apply(self, parent):
         """
         Returns conflicting (incompatible) dependency
         """
-        for new_dep in parent.dependencies:
+        with tracer.span('apply', package=parent.name):
+            return self._apply(parent)
+
+    def _apply(self, parent):
+        new_deps = parent.dependencies
+        self.graph.connect(parent, *new_deps)
+        # fetch releases of new deps in background while the first one is fetched here
+        added = [new_dep for new_dep in new_deps if self.graph.get(new_dep.name) is None]
+        self.prefetcher.schedule(added[1:], pins=self.pins)
+        for new_dep in new_deps:
             other_dep = self.graph.get(new_dep.name)
             if other_dep is None:
                 # add new dep to graph
                 other_dep = new_dep.copy()
+                other_dep.pin = self.pins.get(other_dep.base_name)
                 self.graph.add(other_dep)
             elif isinstance(other_dep, RootDependency):
                 # if some of the dependencies cyclicaly depends on root
@@ -45,6 +87,9 @@ class Resolver:
                     other_dep += new_dep
                 except TypeError:   # conflict happened
                     return other_dep
+                # not used dep can get used again
+                if not other_dep.applied:
+                    self.graph.touch(other_dep)
             # check
             if not other_dep.compat:
                 return other_dep
@@ -60,6 +105,7 @@ class Resolver:
         # it must be before actual unapplying to avoid recursion on circular dependencies
         if not soft:
             dep.applied = False
+            self.graph.touch(dep)
 
         for child in dep.dependencies:
             child_name = child.name
@@ -75,7 +121,25 @@ class Resolver:
         if not soft and dep.locked:
             dep.unlock()
 
-    def resolve(self, debug: bool = False, silent: bool = False, level: Optional[int] = None) -> bool:
+    def resolve(self, debug: bool = False, silent: bool = False, level: Optional[int] = None,
+                checkpoint=None) -> bool:
+        """
+        checkpoint -- save state into it if resolving failed or interrupted.
+        """
+        trace = config.get('trace')
+        # forked branches inherit started tracer, and only the parent dumps it
+        traced = bool(trace) and not tracer.enabled
+        if traced:
+            tracer.start()
+        try:
+            return self._resolve_loop(debug=debug, silent=silent, level=level, checkpoint=checkpoint)
+        finally:
+            self.prefetcher.close()
+            if traced:
+                tracer.stop()
+                tracer.dump(path=trace['path'], format=trace.get('format'))
+
+    def _resolve_loop(self, debug: bool, silent: bool, level: Optional[int], checkpoint) -> bool:
         if silent:
             spinner = nullcontext(type('Mock', (), {}))
         else:
@@ -83,9 +147,30 @@ class Resolver:
 
         with spinner as spinner:
             while True:
-                resolved = self._resolve(debug=debug, silent=silent, level=level, spinner=spinner)
+                try:
+                    with tracer.span(
+                        'iteration',
+                        layers=len(self.graph._layers),
+                        mutations=self.mutator.mutations,
+                    ):
+                        resolved = self._resolve(debug=debug, silent=silent, level=level, spinner=spinner)
+                except KeyboardInterrupt:
+                    if checkpoint is not None:
+                        checkpoint.dump(self)
+                    raise
                 if resolved is None:
                     continue
+                logger.debug('resolving finished', extra=dict(
+                    resolved=resolved,
+                    engine=type(self.mutator).__name__,
+                    backtracks=self.mutator.mutations,
+                    decisions=self.mutator.decisions,
+                ))
+                if checkpoint is not None:
+                    if resolved:
+                        checkpoint.clear()
+                    else:
+                        checkpoint.dump(self)
                 self.graph.clear()  # remove unused deps from graph
                 return resolved
 
@@ -116,13 +201,22 @@ class Resolver:
         if no_conflicts:
             return None
 
+        # try the best mutations in parallel processes
+        if self.branches > 1 and 'fork' in multiprocessing.get_all_start_methods():
+            if self._resolve_branches():
+                # the state of the resolved branch is applied, continue from it
+                return None
+
         # if we have conflict, try to mutate graph
-        groups = self.mutator.mutate(self.graph)
+        with tracer.span('mutate', package=self.graph.conflict.name):
+            groups = self.mutator.mutate(self.graph)
         # if cannot mutate
         if groups is None:
             return False
+        self._mutate(groups)
+
+    def _mutate(self, groups) -> None:
         self.graph.conflict = None
-        # apply mutation
         for group in groups:
             dep = self.graph.get(group.name)
             if dep.group.number != group.number:
@@ -132,6 +226,82 @@ class Resolver:
                 ))
                 self.unapply(dep)
                 dep.group = group
+                self.graph.connect(dep, *dep.dependencies)
+
+    def _resolve_branches(self) -> bool:
+        """Resolve every of the best mutations in a forked process.
+
+        Branches share the on-disk cache. The state of the first resolved branch
+        is applied to this graph, and other branches are terminated.
+        Returns False if there are not enough mutations to branch or all branches failed,
+        so the conflict is handled by the mutator as usual.
+        """
+        candidates = self.mutator.get_candidates(self.graph, count=self.branches)
+        if len(candidates) < 2:
+            return False
+        logger.debug('resolve branches', extra=dict(count=len(candidates)))
+        # don't fork with running threads
+        self.prefetcher.close()
+
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        processes = []
+        for groups in candidates:
+            process = context.Process(target=self._resolve_branch, args=(groups, results), daemon=True)
+            process.start()
+            processes.append(process)
+
+        state = None
+        finished = 0
+        try:
+            while finished < len(processes):
+                try:
+                    resolved, branch_state = results.get(timeout=1)
+                except Empty:
+                    if any(process.is_alive() for process in processes) or not results.empty():
+                        continue
+                    break
+                finished += 1
+                if resolved:
+                    state = branch_state
+                    break
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+
+        # a branch can fail because of an error, or the graph can be resolved
+        # by a mutation that isn't in the top, so let the mutator try it.
+        if state is None:
+            logger.debug('all branches failed')
+            return False
+        self.graph.reset()
+        # roots are applied again from the state
+        for root in self.graph.get_layer(0):
+            root.applied = False
+        Checkpoint.apply_state(self, state)
+        return True
+
+    def _resolve_branch(self, groups, results) -> None:
+        """Apply mutation and resolve graph in the forked process.
+        """
+        # branches don't fork again, the count of processes would grow exponentially
+        self.branches = 1
+        try:
+            # the inherited loop shares the selector with the parent process
+            asyncio.set_event_loop(asyncio.new_event_loop())
+            self.mutator.accept(groups)
+            self._mutate(groups)
+            resolved = self.resolve(silent=True)
+            state = Checkpoint.make_state(self) if resolved else None
+        except BaseException:
+            logger.exception('branch failed')
+            resolved, state = False, None
+        finally:
+            # the process exits without atexit handlers, so save fetched records now
+            get_storage().flush()
+        results.put((resolved, state))
 
     def apply_envs(self, envs: set) -> None:
         if not any(root.dependencies for root in self.graph.get_layer(0)):
@@ -154,6 +324,7 @@ class Resolver:
             # deps that won't be unapplied.
             self.unapply(dep, soft=True)
             dep.applied = False
+            self.graph.touch(dep)
 
         # Some child deps can be unapplied from other child deps, but we need them.
         # For example, if we need A, but don't need B, and A and B depends on C,
@@ -189,6 +360,64 @@ class Resolver:
 
             self.unapply(dep, soft=True)
             dep.applied = False
+            self.graph.touch(dep)
+
+    def apply_targets(self, targets: Sequence[Target]) -> None:
+        """Mark every dep by targets where it's required.
+
+        The graph is resolved once for all targets. The dep is required for a target
+        if any parent that is required for it requires the dep with markers
+        that are true for this target. Deps that aren't required for any target
+        are dropped, and markers of others are restricted by their targets.
+        """
+        roots = {root.name for root in self.graph.get_layer(0)}
+        deps = [dep for dep in self.graph if dep.applied]
+        fits = {name: frozenset(targets) for name in roots}
+        cache = dict()  # type: Dict[str, FrozenSet[Target]]
+
+        def get_fits(marker) -> FrozenSet[Target]:
+            if not marker:
+                return frozenset(targets)
+            marker = str(marker)
+            if marker not in cache:
+                parsed = Marker(marker)
+                cache[marker] = frozenset(t for t in targets if parsed.evaluate(t.environment))
+            return cache[marker]
+
+        # targets of parents are propagated to children until nothing changes
+        changed = True
+        while changed:
+            changed = False
+            for dep in deps:
+                result = frozenset()
+                for source in dep.constraint.sources:
+                    parent_fits = fits.get(source)
+                    if parent_fits:
+                        result |= parent_fits & get_fits(dep.marker.get_source(source))
+                if result != fits.get(dep.name, frozenset()):
+                    fits[dep.name] = result
+                    changed = True
+
+        for dep in deps:
+            dep_fits = fits.get(dep.name)
+            if not dep_fits:
+                logger.debug('drop by targets', extra=dict(dep=dep.name))
+                self.unapply(dep, soft=True)
+                self.graph.remove(dep)
+                continue
+            dep_targets = [target for target in targets if target in dep_fits]
+            if len(dep_targets) < len(targets):
+                dep.marker.restrict(' or '.join('({})'.format(target.marker) for target in dep_targets))
+
+            # releases are restricted by target pythons while resolving,
+            # but only pythons from `PYTHON_VERSIONS` can be checked in this way
+            python = dep.group.best_release.python
+            for target in dep_targets:
+                if python is not None and target.python not in python:
+                    logger.warning('release is incompatible with target', extra=dict(
+                        release=str(dep.group.best_release),
+                        target=str(target),
+                    ))
 
     def _apply_deps(self, deps, debug: bool = False) -> bool:
         for dep in deps:
@@ -201,6 +430,7 @@ class Resolver:
                 constraint=conflict.constraint,
             ))
             self.graph.conflict = conflict.copy()
+            tracer.mark('conflict', package=conflict.name, constraint=conflict.constraint)
 
             if debug:
                 print(analyze_conflict(
@@ -8,7 +8,7 @@ from typing import Optional, Tuple, Union
 import attr
 
 # app
-from ..controllers import Graph, Mutator, Resolver
+from ..controllers import Graph, Resolver, get_mutator
 from ..models import RootDependency
 
 
@@ -83,7 +83,7 @@ class BaseConverter:
     def _get_resolver(root: RootDependency) -> Resolver:
         return Resolver(
             graph=Graph(root),
-            mutator=Mutator(),
+            mutator=get_mutator(),
         )
 
     def loads_resolver(self, content: str) -> Resolver:
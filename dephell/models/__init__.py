@@ -13,6 +13,7 @@ from .release import Release
 from .requirement import Requirement
 from .root import RootDependency
 from .simple_dependency import SimpleDependency
+from .target import Target
 
 
 __all__ = [
@@ -30,4 +31,5 @@ __all__ = [
     'Requirement',
     'RootDependency',
     'SimpleDependency',
+    'Target',
 ]
@@ -1,18 +1,69 @@
 # built-in
 from copy import deepcopy
+from functools import lru_cache
+from typing import Optional, Tuple
 
 # external
 from dephell_specifier import RangeSpecifier
+from packaging.specifiers import InvalidSpecifier, SpecifierSet
+from packaging.version import InvalidVersion, Version
+
+
+Bounds = Tuple[Optional[Version], Optional[Version]]
+
+
+@lru_cache(maxsize=4096)
+def _get_bounds(spec: str) -> Bounds:
+    """The lowest and the highest public version that can match the spec.
+
+    Bounds are inclusive and can be wider than the spec, but never narrower.
+    `None` means no bound. Specs that aren't PEP-440 have no bounds at all.
+    """
+    lowers = []
+    uppers = []
+    for part in spec.split('||'):
+        try:
+            specifiers = SpecifierSet(part.strip())
+        except InvalidSpecifier:
+            return None, None
+        lower = upper = None
+        for specifier in specifiers:
+            if '*' in specifier.version:
+                continue
+            try:
+                version = Version(specifier.version)
+            except InvalidVersion:
+                return None, None
+            # local versions are ordered after public ones, don't bound by them
+            if version.local:
+                continue
+            if specifier.operator in ('>', '>=', '==', '~='):
+                if lower is None or version > lower:
+                    lower = version
+            if specifier.operator in ('<', '<=', '=='):
+                if upper is None or version < upper:
+                    upper = version
+        lowers.append(lower)
+        uppers.append(upper)
+
+    lower = None if None in lowers else min(lowers)
+    upper = None if None in uppers else max(uppers)
+    return lower, upper
 
 
 class Constraint:
-    def __init__(self, source, spec):
+    def __init__(self, source, spec, group=None):
         """
         source (Dependency)
         spec (str, LegacySpecifier, Specifier)
+        group (Group): group of source that makes the constraint, source.group by default
         """
+        if group is None:
+            group = source.group
         self._specs = {source.name: RangeSpecifier(spec)}
-        self._groups = {source.name: source.group.number}
+        self._groups = {source.name: group.number}
+        # copies share `_specs` and `_groups` until one of them is changed
+        self._shared = False
 
     # properties
 
@@ -31,13 +82,46 @@ class Constraint:
             result.append((name, str(spec)))
         return tuple(sorted(result))
 
+    @property
+    def fingerprint(self) -> frozenset:
+        """Specifiers of all sources. Constraints with the same fingerprint
+        filter releases in the same way.
+        """
+        return frozenset(map(str, self._specs.values()))
+
+    @property
+    def bounds(self) -> Bounds:
+        """The lowest and the highest version that can pass `filter`.
+        """
+        lower = upper = None
+        for spec in self.fingerprint:
+            spec_lower, spec_upper = _get_bounds(spec)
+            if spec_lower is not None and (lower is None or spec_lower > lower):
+                lower = spec_lower
+            if spec_upper is not None and (upper is None or spec_upper < upper):
+                upper = spec_upper
+        return lower, upper
+
     # methods
 
+    def _detach(self) -> None:
+        """Get own copy of shared containers before changing them.
+        """
+        if not self._shared:
+            return
+        self._specs = self._specs.copy()
+        self._groups = self._groups.copy()
+        self._shared = False
+
     def attach_time(self, releases) -> None:
         """Attach time to all specifiers if possible
         """
-        for spec in self._specs.values():
+        # specifiers can be shared between constraints, don't change them inplace
+        self._detach()
+        for name, spec in list(self._specs.items()):
+            spec = deepcopy(spec)
             spec.attach_time(releases)
+            self._specs[name] = spec
 
     def apply(self, dep, spec) -> None:
         if dep.name in self._groups:
@@ -47,12 +131,14 @@ class Constraint:
             # unapply old group of this package:
             self.unapply(dep.name)
         # save params
+        self._detach()
         self._specs[dep.name] = RangeSpecifier(spec)
         self._groups[dep.name] = dep.group.number
 
     def unapply(self, name: str) -> None:
         if name not in self._specs:
             return
+        self._detach()
         del self._specs[name]
         del self._groups[name]
 
@@ -69,7 +155,11 @@ class Constraint:
         return result
 
     def copy(self) -> 'Constraint':
-        return deepcopy(self)
+        obj = type(self).__new__(type(self))
+        obj._specs = self._specs
+        obj._groups = self._groups
+        obj._shared = self._shared = True
+        return obj
 
     # magic methods
 
@@ -79,6 +169,7 @@ class Constraint:
     def __iand__(self, other):
         if not isinstance(other, Constraint):
             return NotImplemented
+        self._detach()
         for name, group in other._groups.items():
             # if group already applied
             # if self._groups.get(name, -1) == group:
@@ -87,7 +178,8 @@ class Constraint:
 
             spec = other._specs[name]
             if name in self._specs:
-                self._specs[name] += spec
+                # specifiers can be shared between constraints, don't change them inplace
+                self._specs[name] = self._specs[name] + spec
             else:
                 self._specs[name] = spec
         return self
@@ -98,6 +190,7 @@ class Constraint:
     def __ior__(self, other):
         if not isinstance(other, Constraint):
             return NotImplemented
+        self._detach()
         for name, group in other._groups.items():
             self._groups[name] = group
             spec = other._specs[name]
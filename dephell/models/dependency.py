@@ -1,6 +1,6 @@
 # built-in
-from copy import deepcopy
-from typing import Tuple
+from copy import copy
+from typing import Optional, Tuple
 
 # external
 import attr
@@ -9,10 +9,12 @@ from packaging.utils import canonicalize_name
 
 # app
 from ..cached_property import cached_property
+from ..tracing import tracer
 from .constraint import Constraint
 from .group import Group
 from .groups import Groups
 from .marker_tracker import MarkerTracker
+from .python_mask import get_python_mask
 
 
 @attr.s(eq=False, order=False)
@@ -25,6 +27,8 @@ class Dependency:
 
     # flags
     applied = attr.ib(type=bool, default=False, repr=False)
+    # version from the existing lockfile, preferred while it is compatible
+    pin = attr.ib(default=None, repr=False)
 
     # optional info
     description = attr.ib(type=str, default='', repr=False)     # summary
@@ -63,11 +67,21 @@ class Dependency:
         """By first access choose and save best group
         """
         self.groups.actualize()
+        if self.pin is not None:
+            group = self._get_pinned_group()
+            if group is not None:
+                return group
         for group in self.groups:
             if not group.empty:
                 return group
         raise LookupError('all dependencies are empty')
 
+    def _get_pinned_group(self) -> Optional[Group]:
+        group = self.groups.get_pinned(self.pin)
+        if group is None or group.empty:
+            return None
+        return group
+
     @property
     def dependencies(self) -> Tuple['Dependency', ...]:
         """
@@ -80,15 +94,34 @@ class Dependency:
         deps = self.__dict__.get('dependencies')
         if deps is not None:
             return deps
+        return self.get_dependencies(self.group)
+
+    def get_dependencies(self, group: Group) -> Tuple['Dependency', ...]:
+        """Make dependencies of the given group for this dependency.
+
+        Made deps are cached in the group until releases dependencies are changed,
+        so requirements are parsed once per group. Don't change returned deps,
+        copy them before. It doesn't lock the dependency, so any group can be checked.
+        """
+        source = group.random.dependencies
+        # deps can get repo from this dep, so they are shared only for the same repo.
+        # Made deps refer to the repo, so its id can't be reused while they are cached.
+        key = (self.name, id(self.repo), frozenset(self.envs), frozenset(self.inherited_envs))
+        cached = group._materialized.get(key)
+        if cached is not None and cached[0] is source:
+            tracer.count('materialize_hit')
+            return cached[1]
+        tracer.count('materialize_miss')
 
         from ..controllers import DependencyMaker
         deps = []
-        for dep in self.group.dependencies:
+        for dep in group.dependencies:
             if isinstance(dep, Dependency):
                 deps.append(dep)
             else:
                 deps.extend(DependencyMaker.from_requirement(
                     source=self,
+                    group=group,
                     req=dep,
                     # subdependencies has no direct envs, let's force it
                     envs=set(),
@@ -104,7 +137,9 @@ class Dependency:
             for dep in deps:
                 dep.repo = self.repo
 
-        return tuple(deps)
+        deps = tuple(deps)
+        group._materialized[key] = (source, deps)
+        return deps
 
     @dependencies.setter
     def dependencies(self, dependencies: tuple) -> None:
@@ -128,20 +163,19 @@ class Dependency:
         needed = self.marker.markers.python_version
         if needed is None:
             return True
+        needed = get_python_mask(needed)
 
         if self.locked:
-            required = self.group.best_release.python
-            if required is None:
-                return True
-            return (needed + required).python_compat
+            return self.group.python_compat(needed)
 
+        # the pinned group will be chosen, so don't load other groups
+        pinned = self._get_pinned_group() if self.pin is not None else None
+        if pinned is not None and pinned.python_compat(needed):
+            return True
         for group in self.groups:
             if group.empty:
                 continue
-            required = group.best_release.python
-            if required is None:
-                return True
-            if (needed + required).python_compat:
+            if group.python_compat(needed):
                 return True
         return False
 
@@ -151,6 +185,8 @@ class Dependency:
         if self.locked:
             return not self.group.empty
         # if group hasn't choosed
+        if self.pin is not None and self._get_pinned_group() is not None:
+            return True
         for group in self.groups:
             if not group.empty:
                 return True
@@ -176,8 +212,20 @@ class Dependency:
             self.unlock()
 
     def copy(self) -> 'Dependency':
-        obj = deepcopy(self)
+        """Copy dependency for changing it independently.
+
+        Repository, link and releases are shared. Constraint and markers
+        are shared too until one of the copies changes them.
+        """
+        obj = copy(self)
         obj.constraint = self.constraint.copy()
+        obj.marker = self.marker.copy()
+        obj.links = self.links.copy()
+        obj.envs = self.envs.copy()
+        obj.inherited_envs = self.inherited_envs.copy()
+        obj.locations = self.locations.copy()
+        if 'groups' in self.__dict__:
+            obj.__dict__['groups'] = self.groups.copy(dep=obj)
         if obj.locked:
             obj.unlock()
         return obj
@@ -5,7 +5,7 @@ import attr
 from .release import Release
 
 
-@attr.s(hash=False, eq=False, order=False)
+@attr.s(hash=False, eq=False, order=False, slots=True)
 class GitRelease(Release):
     commit = attr.ib(default=None)  # just for information
 
@@ -1,13 +1,22 @@
 # built-in
+from bisect import bisect_left, bisect_right
 from operator import attrgetter
 from typing import Optional
 
+# external
+from packaging.version import Version
+
 # app
 from ..cached_property import cached_property
 from ..config import config
+from ..tracing import tracer
+from .release import Release
 
 
 class Group:
+    # how many filtered releases sets to keep, the oldest one is dropped first
+    filter_memo_size = 32
+
     def __init__(self, number: int, releases: set, dep=None):
         """
         releases (set)
@@ -15,17 +24,57 @@ class Group:
         self.all_releases = self.releases = releases
         self.number = number
         self.dep = dep
+        # filtered releases by constraint fingerprint
+        self._filtered = dict()
+        # (dep name, envs, inherited envs) -> (deps of releases, made Dependency objects)
+        self._materialized = dict()
+
+    @property
+    def releases(self) -> set:
+        return self._releases
+
+    @releases.setter
+    def releases(self, releases: set) -> None:
+        # constraint is often applied again without changes, keep calculated values
+        old = getattr(self, '_releases', None)
+        if old is not None and (old is releases or len(old) == len(releases) and set(old) == set(releases)):
+            return
+        self._releases = releases
+        # drop everything that is calculated from releases
+        self._ordered = None
+        self._sorted_versions = None
+        self._best = None
+        self._python_mask = None
+
+    @property
+    def ordered(self) -> tuple:
+        """Releases sorted by time and version, the same order as strategies use.
+        """
+        if self._ordered is None:
+            self._ordered = tuple(sorted(self.releases, key=attrgetter('time', 'version')))
+        return self._ordered
 
     # BEST RELEASE PROPERTIES
 
     @property
     def best_release(self):
-        strategy = max if config['strategy'] == 'max' else min
-        best_time = strategy(release.time for release in self.releases)
-        best_releases = [release for release in self.releases if release.time == best_time]
-        if len(best_releases) == 1:
-            return best_releases[0]
-        return strategy(self.releases, key=attrgetter('version'))
+        key = (config['strategy'], getattr(self.dep, 'pin', None))
+        if self._best is not None and self._best[0] == key:
+            return self._best[1]
+        best = self._get_best_release(strategy=key[0], pin=key[1])
+        self._best = (key, best)
+        return best
+
+    def _get_best_release(self, strategy: str, pin):
+        if pin is not None:
+            for release in self.releases:
+                if release.version == pin:
+                    return release
+        # the newest release for `max`, and the oldest one for `min`.
+        # If releases have the same time, the highest or the lowest version is chosen.
+        if strategy == 'max':
+            return self.ordered[-1]
+        return self.ordered[0]
 
     @property
     def time(self):
@@ -84,13 +133,90 @@ class Group:
     def versions(self) -> set:
         return {release.version for release in self.all_releases}
 
+    @property
+    def sorted_versions(self) -> tuple:
+        """Versions of releases from the lowest to the highest.
+        """
+        if self._sorted_versions is None:
+            self._sorted_versions = tuple(sorted(release.version for release in self.releases))
+        return self._sorted_versions
+
+    @property
+    def version_bounds(self) -> tuple:
+        """The lowest and the highest versions of releases.
+        """
+        versions = self.sorted_versions
+        if not versions:
+            return None, None
+        return versions[0], versions[-1]
+
+    @property
+    def python_mask(self) -> int:
+        """Bitmap of python versions that any of releases supports.
+        """
+        if self._python_mask is None:
+            mask = 0
+            for release in self.releases:
+                mask |= release.python_mask
+            self._python_mask = mask
+        return self._python_mask
+
+    def python_compat(self, mask: int) -> bool:
+        """Is the best release compatible with any of the given python versions.
+        """
+        # no release supports these pythons, so don't look for the best one
+        if mask and not self.python_mask & mask:
+            return False
+        best = self.best_release
+        return best.python is None or bool(best.python_mask & mask)
+
+    @cached_property
+    def _index(self) -> Optional[tuple]:
+        """Public versions and releases sorted by them, for bisection.
+
+        Git releases can be matched not by version, so they aren't indexed.
+        """
+        if any(type(release) is not Release for release in self.all_releases):
+            return None
+        releases = sorted(self.all_releases, key=attrgetter('version'))
+        keys = []
+        for release in releases:
+            version = release.version
+            if getattr(version, 'local', None):
+                version = Version(version.public)
+            keys.append(version)
+        return keys, releases
+
+    def filter(self, constraint) -> set:
+        """Releases from the group that pass the constraint.
+        """
+        fingerprint = constraint.fingerprint
+        releases = self._filtered.get(fingerprint)
+        if releases is not None:
+            tracer.count('filter_memo_hit')
+            return releases
+        tracer.count('filter_memo_miss')
+
+        releases = self.all_releases
+        if self._index is not None:
+            keys, releases = self._index
+            lower, upper = constraint.bounds
+            left = 0 if lower is None else bisect_left(keys, lower)
+            right = len(keys) if upper is None else bisect_right(keys, upper)
+            releases = releases[left:right]
+        with tracer.span('filter', package=self.name):
+            releases = constraint.filter(releases)
+        if len(self._filtered) >= self.filter_memo_size:
+            del self._filtered[next(iter(self._filtered))]
+        self._filtered[fingerprint] = releases
+        return releases
+
     @property
     def empty(self) -> bool:
         return not bool(self.releases)
 
     def __str__(self):
-        versions = sorted(release.version for release in self.releases)
-        versions = [str(v) for v in versions]
+        versions = [str(v) for v in self.sorted_versions]
         if not versions:
             versions = '[EMPTY]'
         elif len(versions) == 1:
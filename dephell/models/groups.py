@@ -8,10 +8,10 @@ import attr
 # app
 from ..cached_property import cached_property
 from ..config import config
+from ..constants import PYTHON_VERSIONS
+from ..tracing import tracer
 from .group import Group
-
-
-loop = asyncio.get_event_loop()
+from .target import Target
 
 
 def get_key(release) -> str:
@@ -26,12 +26,16 @@ class Groups:
 
     _loaded_groups = attr.ib(factory=list)
     _loaded_releases_count = attr.ib(default=0)
+    _pinned_group = attr.ib(type=Optional[Group], default=None)
 
     chunk_size = 20
+    # the pinned group isn't a part of the sequence, so it can't get a number from it
+    pinned_number = -1
 
     @cached_property
     def releases(self) -> tuple:
-        releases = self.dep.repo.get_releases(self.dep)
+        with tracer.span('get_releases', package=self.dep.name):
+            releases = self.dep.repo.get_releases(self.dep)
         # sort
         reverse = True if config['strategy'] == 'max' else False
         releases = sorted(releases, reverse=reverse)
@@ -41,14 +45,34 @@ class Groups:
                 release.extra = self.extra
         if not releases:
             raise LookupError('cannot find releases for ' + self.dep.name)
+        # all targets get the same release, so it must support all of them
+        mask = self._get_targets_mask()
+        if mask:
+            releases = [release for release in releases if release.python_mask & mask == mask]
+            if not releases:
+                raise LookupError('cannot find releases compatible with all targets for ' + self.dep.name)
         return releases
 
+    def _get_targets_mask(self) -> int:
+        """Bitmap of pythons from `--targets` where the dependency is required.
+        """
+        targets = config.get('targets')
+        if not targets:
+            return 0
+        pythons = {Target.parse(target).python for target in targets}
+        needed = self.dep.marker.markers.python_version if self.dep.marker else None
+        mask = 0
+        for bit, version in enumerate(PYTHON_VERSIONS):
+            if version in pythons and (needed is None or version in needed):
+                mask |= 1 << bit
+        return mask
+
     async def _fetch_all_deps(self, releases):
         tasks = []
         not_loaded_releases = []
         tasks_count = 0
         for release in releases:
-            if 'dependencies' in release.__dict__:
+            if release.dependencies is not None:
                 continue
             task = asyncio.ensure_future(self.dep.repo.get_dependencies(
                 name=release.name,
@@ -110,7 +134,7 @@ class Groups:
         missed = []
         for release in releases:
             # collect missed releases
-            if 'dependencies' not in release.__dict__:
+            if release.dependencies is None:
                 missed.append(release)
                 continue
 
@@ -146,7 +170,54 @@ class Groups:
             extra=self.extra,
         )
         gathered = asyncio.gather(coroutine)
-        release.dependencies = loop.run_until_complete(gathered)[0]
+        with tracer.span('fetch_deps', package=self.dep.name):
+            release.dependencies = asyncio.get_event_loop().run_until_complete(gathered)[0]
+
+    def get_pinned(self, version) -> Optional[Group]:
+        """Group with the only release of the given version.
+
+        Groups are made from releases with the same deps in a row, so the group
+        that has the release can be found only after deps of all newer releases are loaded.
+        The pinned group is made from one release instead, and nothing else is loaded.
+        """
+        if self._pinned_group is not None:
+            if self._pinned_group.all_releases[0].version == version:
+                self.actualize(group=self._pinned_group)
+                return self._pinned_group
+        for release in self.releases:
+            if release.version == version:
+                break
+        else:
+            return None
+        self._load_release_deps(release)
+        self._pinned_group = Group(releases=[release], number=self.pinned_number, dep=self.dep)
+        self.actualize(group=self._pinned_group)
+        return self._pinned_group
+
+    def copy(self, dep) -> 'Groups':
+        """Copy groups for a copy of the dependency.
+
+        Releases, filtering and dependencies caches are shared, but every group gets own filtered releases.
+        """
+        obj = type(self)(dep=dep, extra=self.extra, loaded_releases_count=self._loaded_releases_count)
+        if 'releases' in self.__dict__:
+            obj.__dict__['releases'] = self.releases
+        for group in self._loaded_groups:
+            new_group = Group(releases=group.all_releases, number=group.number, dep=dep)
+            new_group.releases = group.releases
+            new_group._ordered = group._ordered
+            new_group._sorted_versions = group._sorted_versions
+            # the same releases are filtered in the same way for any copy
+            new_group._filtered = group._filtered
+            new_group._materialized = group._materialized
+            if '_index' in group.__dict__:
+                new_group.__dict__['_index'] = group._index
+            obj._loaded_groups.append(new_group)
+        pinned = self._pinned_group
+        if pinned is not None:
+            obj._pinned_group = Group(releases=pinned.all_releases, number=pinned.number, dep=dep)
+            obj._pinned_group.releases = pinned.releases
+        return obj
 
     def _make_group(self, releases) -> Group:
         group = Group(
@@ -175,9 +246,10 @@ class Groups:
         prev_key = None
         releases = []
         for release in self.releases[self._loaded_releases_count:]:
-            if 'dependencies' not in release.__dict__:
+            if release.dependencies is None:
                 future = asyncio.ensure_future(self._fetch_releases_deps())
-                loop.run_until_complete(future)
+                with tracer.span('fetch_deps', package=self.dep.name):
+                    asyncio.get_event_loop().run_until_complete(future)
 
             key = get_key(release)
             if prev_key is None:
@@ -201,11 +273,13 @@ class Groups:
         if group:
             groups = [group]
         else:
-            if not self._loaded_groups:
-                return False
             groups = self._loaded_groups
+            if self._pinned_group is not None:
+                groups = groups + [self._pinned_group]
+            if not groups:
+                return False
 
-        filtrate = self.dep.constraint.filter
+        constraint = self.dep.constraint
         for group in groups:
-            group.releases = filtrate(group.all_releases)
+            group.releases = group.filter(constraint)
         return True
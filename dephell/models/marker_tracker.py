@@ -1,3 +1,6 @@
+# built-in
+from typing import Optional
+
 # external
 from dephell_markers import Markers, OrMarker
 
@@ -5,16 +8,42 @@ from dephell_markers import Markers, OrMarker
 class MarkerTracker:
     def __init__(self):
         self._markers = dict()
+        # copies share `_markers` until one of them is changed
+        self._shared = False
+        # markers that must be true in addition to markers from sources
+        self._restriction = None
 
     @property
     def markers(self) -> Markers:
         if len(self._markers) == 1:
-            return next(iter(self._markers.values()))
-        container = Markers()
-        markers = [m._marker for m in self._markers.values() if m._marker]
-        container._marker = OrMarker(*markers)
+            container = next(iter(self._markers.values()))
+        else:
+            container = Markers()
+            markers = [m._marker for m in self._markers.values() if m._marker]
+            container._marker = OrMarker(*markers)
+        if self._restriction is None:
+            return container
+        if not container:
+            return self._restriction
+        # don't change markers of sources
+        container = Markers(str(container))
+        container &= self._restriction
         return container
 
+    def get_source(self, source) -> Optional[Markers]:
+        """Get markers that the given source requires.
+        """
+        if type(source) is not str:
+            source = source.name
+        return self._markers.get(source)
+
+    def restrict(self, markers) -> None:
+        """Require the given markers whatever sources require.
+        """
+        if type(markers) is str:
+            markers = Markers(markers)
+        self._restriction = markers
+
     def apply(self, *, source, markers) -> 'MarkerTracker':
         if not markers:
             return self
@@ -24,10 +53,14 @@ class MarkerTracker:
             raise ValueError('marker for given source already added')
         if type(markers) is str:
             markers = Markers(markers)
+        self._detach()
         self._markers[source] = markers
         return self
 
     def merge(self, other: 'MarkerTracker') -> None:
+        if not other._markers:
+            return
+        self._detach()
         for source, marker in other._markers.items():
             self._markers[source] = marker
 
@@ -35,14 +68,29 @@ class MarkerTracker:
         if type(source) is not str:
             source = source.name
         if source in self._markers:
+            self._detach()
             del self._markers[source]
 
+    def copy(self) -> 'MarkerTracker':
+        obj = type(self)()
+        obj._markers = self._markers
+        obj._restriction = self._restriction
+        obj._shared = self._shared = True
+        return obj
+
+    def _detach(self) -> None:
+        if self._shared:
+            self._markers = self._markers.copy()
+            self._shared = False
+
     def __getattr__(self, name):
         if name not in dir(Markers):
             raise AttributeError(name)
         return getattr(self.markers, name)
 
     def __bool__(self) -> bool:
+        if self._restriction is not None:
+            return True
         return any(marker for marker in self._markers.values())
 
     def __str__(self) -> str:
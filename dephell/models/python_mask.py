@@ -0,0 +1,27 @@
+# app
+from ..constants import PYTHON_VERSIONS
+
+
+# every bit is a python version from PYTHON_VERSIONS
+ALL_PYTHONS = (1 << len(PYTHON_VERSIONS)) - 1
+
+# there are not so many different python specifiers, so cache them all
+_masks = dict()
+
+
+def get_python_mask(specifier) -> int:
+    """Get bitmap of python versions that the specifier matches.
+
+    Specifier can be RangeSpecifier or None (that matches any python).
+    """
+    if specifier is None:
+        return ALL_PYTHONS
+    spec = str(specifier)
+    mask = _masks.get(spec)
+    if mask is None:
+        mask = 0
+        for bit, version in enumerate(PYTHON_VERSIONS):
+            if version in specifier:
+                mask |= 1 << bit
+        _masks[spec] = mask
+    return mask
@@ -1,31 +1,71 @@
 # built-in
+import sys
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
 # external
 import attr
 from dephell_specifier import RangeSpecifier
 from packaging.utils import canonicalize_name
-from packaging.version import parse
+from packaging.version import Version, parse
 
 # app
-from ..cached_property import cached_property
+from .python_mask import get_python_mask
 
 
-@attr.s(hash=False, eq=False, order=False)
-class Release:
-    dependencies = None  # type: tuple
+# Packages can have thousands of releases, and the same releases come from
+# different repos and from the cache. So, every release refers to the same
+# name, version and hashes objects as other releases of this package.
+
+
+@lru_cache(maxsize=2 ** 12)
+def _get_name(raw_name: str) -> str:
+    return sys.intern(canonicalize_name(raw_name))
+
+
+_versions = dict()
+_hashes = dict()
+
 
+def _get_version(version) -> Version:
+    if not isinstance(version, str):
+        return version
+    parsed = _versions.get(version)
+    if parsed is None:
+        parsed = parse(version)
+        _versions[version] = parsed
+    return parsed
+
+
+def _get_hashes(hashes) -> tuple:
+    if not hashes:
+        return ()
+    # hashes are unique for a file, so there is no need to intern them.
+    # The key is the same tuple as the value, so it costs only the dict slot
+    hashes = tuple(hashes)
+    return _hashes.setdefault(hashes, hashes)
+
+
+@attr.s(hash=False, eq=False, order=False, slots=True)
+class Release:
     raw_name = attr.ib(type=str)
-    version = attr.ib(converter=parse)              # type: ignore
+    version = attr.ib(converter=_get_version)       # type: ignore
     time = attr.ib(repr=False)                      # upload_time
     python = attr.ib(default=None, repr=False)      # requires_python
-    hashes = attr.ib(factory=tuple, repr=False)     # digests/sha256
+    hashes = attr.ib(factory=tuple, converter=_get_hashes, repr=False)  # digests/sha256
 
     extra = attr.ib(type=Optional[str], default=None)
 
+    # None until dependencies are fetched
+    dependencies = attr.ib(type=tuple, default=None, init=False, repr=False)
+    name = attr.ib(type=str, init=False, repr=False)
+    # `python` and its mask, `python` can be changed after init
+    _python_mask = attr.ib(default=None, init=False, repr=False)
+
     def __attrs_post_init__(self):
         assert '[' not in self.raw_name, self.raw_name
+        self.name = _get_name(self.raw_name)
 
     @classmethod
     def from_response(cls, name, version, info, extra=None):
@@ -43,9 +83,14 @@ class Release:
             extra=extra,
         )
 
-    @cached_property
-    def name(self) -> str:
-        return canonicalize_name(self.raw_name)
+    @property
+    def python_mask(self) -> int:
+        """Bitmap of python versions from `PYTHON_VERSIONS` that the release supports.
+        """
+        cached = self._python_mask
+        if cached is None or cached[0] is not self.python:
+            cached = self._python_mask = (self.python, get_python_mask(self.python))
+        return cached[1]
 
     def __hash__(self) -> int:
         return hash((self.name, self.version))
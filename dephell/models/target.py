@@ -0,0 +1,61 @@
+# built-in
+from types import MappingProxyType
+from typing import Dict, Optional
+
+# external
+import attr
+
+
+# sys_platform -> (platform_system, os_name)
+PLATFORMS = MappingProxyType({
+    'linux': ('Linux', 'posix'),
+    'darwin': ('Darwin', 'posix'),
+    'win32': ('Windows', 'nt'),
+})
+
+
+@attr.s(frozen=True)
+class Target:
+    """Environment (python version and platform) to lock dependencies for.
+    """
+    python = attr.ib(type=str)
+    platform = attr.ib(type=Optional[str], default=None)
+
+    @classmethod
+    def parse(cls, text: str) -> 'Target':
+        """Parse target like `3.8` or `3.8-linux`.
+        """
+        python, _, platform = text.strip().partition('-')
+        # markers compare `python_version` that is always `X.Y`
+        if len(python.split('.')) != 2 or not python.replace('.', '').isdigit():
+            raise ValueError('python version must be like 3.8: ' + python)
+        if platform and platform not in PLATFORMS:
+            raise ValueError('unsupported platform: ' + platform)
+        return cls(python=python, platform=platform or None)
+
+    @property
+    def environment(self) -> Dict[str, str]:
+        """Values for markers evaluation. Other values are taken from the current environment.
+        """
+        result = dict(
+            python_version=self.python,
+            python_full_version=self.python + '.0',
+            implementation_name='cpython',
+            platform_python_implementation='CPython',
+        )
+        if self.platform:
+            result['sys_platform'] = self.platform
+            result['platform_system'], result['os_name'] = PLATFORMS[self.platform]
+        return result
+
+    @property
+    def marker(self) -> str:
+        result = 'python_version == "{}"'.format(self.python)
+        if self.platform:
+            result += ' and sys_platform == "{}"'.format(self.platform)
+        return result
+
+    def __str__(self) -> str:
+        if self.platform:
+            return '{}-{}'.format(self.python, self.platform)
+        return self.python
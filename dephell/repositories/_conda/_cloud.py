@@ -1,4 +1,5 @@
 # built-in
+import asyncio
 import json
 import sys
 from bz2 import BZ2Decompressor
@@ -70,7 +71,12 @@ class CondaCloudRepo(CondaBaseRepo):
         }),
     )
 
-    def get_releases(self, dep) -> tuple:
+    async def fetch_releases(self, dep) -> tuple:
+        # channels data is downloaded and parsed by blocking code, run it in a thread
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._get_releases, dep)
+
+    def _get_releases(self, dep) -> tuple:
         self._update_dep(dep=dep)
 
         raw_releases = self._releases.get(dep.name)
@@ -111,7 +117,7 @@ class CondaCloudRepo(CondaBaseRepo):
         return tuple(releases)
 
     async def get_dependencies(self, *args, **kwargs):
-        raise NotImplementedError('use get_releases to get deps')
+        raise NotImplementedError('use fetch_releases to get deps')
 
     def search(self, query: Iterable[str]) -> List[Dict[str, str]]:
         fields = self._parse_query(query=query)
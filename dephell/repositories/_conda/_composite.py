@@ -25,15 +25,15 @@ class CondaRepo(CondaBaseRepo):
         if not self.cloud_repo.channels:
             self.cloud_repo.channels = self.channels
 
-    def get_releases(self, dep) -> tuple:
+    async def fetch_releases(self, dep) -> tuple:
         for repo in (self.cloud_repo, self.git_repo):
-            releases = repo.get_releases(dep=dep)
+            releases = await repo.fetch_releases(dep=dep)
             if releases:
                 return releases
         return ()
 
     async def get_dependencies(self, *args, **kwargs):
-        raise NotImplementedError('use get_releases to get deps')
+        raise NotImplementedError('use fetch_releases to get deps')
 
     def search(self, query: Iterable[str]) -> List[Dict[str, str]]:
         return self.cloud_repo.search(query=query)
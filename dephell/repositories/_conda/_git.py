@@ -51,7 +51,6 @@ URL_FIELDS = {
 
 
 logger = getLogger('dephell.repositories.conda')
-loop = asyncio.get_event_loop()
 
 
 @attr.s()
@@ -67,17 +66,18 @@ class CondaGitRepo(CondaBaseRepo):
         'custom': dict(repo='{channel}/{name}', path='recipe/meta.yaml'),
     })
 
-    def get_releases(self, dep) -> tuple:
+    async def fetch_releases(self, dep) -> tuple:
         # get metainfo
         cache = JSONCache('conda-forge', 'releases', dep.name, ttl=config['cache']['ttl'])
         raw_releases = cache.load()
         if raw_releases is None:
-            revs = self._get_revs(name=dep.name)
+            # cookbooks are cloned by blocking code, run it in a thread
+            loop = asyncio.get_event_loop()
+            revs = await loop.run_in_executor(None, self._get_revs, dep.name)
             coroutines = []
             for rev in revs:
                 coroutines.append(self._get_meta(**rev))
-            gathered = asyncio.gather(*coroutines)
-            raw_releases = loop.run_until_complete(gathered)
+            raw_releases = await asyncio.gather(*coroutines)
             cache.dump(raw_releases)
         if not raw_releases:
             return ()
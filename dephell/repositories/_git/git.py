@@ -1,4 +1,5 @@
 # built-in
+import asyncio
 import re
 import subprocess
 from collections import OrderedDict
@@ -70,7 +71,12 @@ class GitRepo(Interface):
             with path.open('r') as stream:
                 return stream.read()
 
-    def get_releases(self, dep) -> tuple:
+    async def fetch_releases(self, dep) -> tuple:
+        # cloning and reading the repo is blocking, run it in a thread
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._get_releases, dep)
+
+    def _get_releases(self, dep) -> tuple:
         releases = []
         # add tags to releases
         for tag, time in reversed(self.tags.items()):
@@ -107,7 +113,7 @@ class GitRepo(Interface):
         self._setup()
         self._call('checkout', self._version_to_rev(version))
         root = LocalRepo(path=self.path).get_root(name=name, version=version)
-        cache.dump(root=root)
+        cache.dump(root)
 
         # filter extras
         deps = root.dependencies
@@ -1,4 +1,5 @@
 # built-in
+import asyncio
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Tuple, Union
@@ -18,14 +19,16 @@ class LocalRepo(Interface):
             path = Path(path)
         self.path = path
 
-    def get_releases(self, dep) -> Tuple[Release, ...]:
+    async def fetch_releases(self, dep) -> Tuple[Release, ...]:
         releases = []
         dist_path = (self.path / 'dist')
         if dist_path.exists():
             repo = WarehouseLocalRepo(name='tmp', path=dist_path)
-            releases = list(repo.get_releases(dep=dep))
+            releases = list(await repo.fetch_releases(dep=dep))
 
-        root = self.get_root(name=dep.name, version='0.0.0')
+        # loading the project from files is blocking, run it in a thread
+        loop = asyncio.get_event_loop()
+        root = await loop.run_in_executor(None, self.get_root, dep.name, '0.0.0')
         self.update_dep_from_root(dep=dep, root=root)
         releases.append(Release(
             raw_name=root.raw_name,
@@ -46,7 +49,7 @@ class LocalRepo(Interface):
         if extra:
             deps = tuple(dep for dep in deps if extra in dep.envs)
 
-        cache.dump(root=root)
+        cache.dump(root)
         return deps
 
     def get_root(self, name: str, version: str):
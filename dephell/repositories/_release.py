@@ -2,6 +2,9 @@
 from datetime import datetime
 from typing import Optional
 
+# external
+import attr
+
 # app
 from ..models.release import Release
 from .base import Interface
@@ -16,9 +19,12 @@ class ReleaseRepo(Interface):
         self.releases = tuple(releases)
         self.deps = deps
 
-    def get_releases(self, dep) -> tuple:
+    async def fetch_releases(self, dep) -> tuple:
         if self.releases:
-            return tuple(release for release in self.releases if release.name == dep.base_name)
+            # fresh objects as other repos return, because groups attach extra
+            # and dependencies to releases, and the repo is shared between copies of deps
+            releases = (release for release in self.releases if release.name == dep.base_name)
+            return tuple(attr.evolve(release, version=str(release.version)) for release in releases)
 
         release = Release(
             raw_name=dep.raw_name,
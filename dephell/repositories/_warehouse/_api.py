@@ -13,12 +13,12 @@ from dephell_licenses import License, licenses
 from packaging.requirements import Requirement
 
 # app
-from ...cache import JSONCache, TextCache
+from ...cache import HTTPBinCache, JSONCache, TextCache
 from ...config import config
 from ...exceptions import InvalidFieldsError, PackageNotFoundError
 from ...models.author import Author
 from ...models.release import Release
-from ...networking import aiohttp_session, requests_session
+from ...networking import aiohttp_session
 from ._base import WarehouseBaseRepo
 
 
@@ -53,6 +53,8 @@ class WarehouseAPIRepo(WarehouseBaseRepo):
     propagate = True
     hash = None
     link = None
+    # increase it when the format of `_make_releases_table` is changed to ignore old cache
+    table_version = 1
 
     def __attrs_post_init__(self):
         # make name canonical
@@ -62,23 +64,19 @@ class WarehouseAPIRepo(WarehouseBaseRepo):
             self.pretty_url = self.url
         self.url = self._get_url(self.url, default_path='/pypi/')
 
-    def get_releases(self, dep) -> tuple:
+    async def fetch_releases(self, dep) -> tuple:
         # retrieve data
-        cache = JSONCache(
-            'warehouse-api', urlparse(self.url).hostname, 'releases', dep.base_name,
+        cache = HTTPBinCache(
+            'warehouse-api', urlparse(self.url).hostname,
+            'releases-v{}'.format(self.table_version), dep.base_name,
             ttl=config['cache']['ttl'],
         )
-        data = cache.load()
-        if data is None:
-            url = '{url}{name}/json'.format(url=self.url, name=dep.base_name)
-            with requests_session() as session:
-                response = session.get(url, auth=self.auth)
-            if response.status_code == 404:
-                raise PackageNotFoundError(package=dep.base_name, url=url)
-            data = response.json()
-            cache.dump(data)
-        elif isinstance(data, str) and data == '':
-            return ()
+        data = await self._get_cached(
+            url='{url}{name}/json'.format(url=self.url, name=dep.base_name),
+            name=dep.base_name,
+            cache=cache,
+            process=self._make_releases_table,
+        )
 
         # update info for dependency
         self._update_dep_from_data(dep=dep, data=data['info'])
@@ -86,14 +84,13 @@ class WarehouseAPIRepo(WarehouseBaseRepo):
         # init releases
         releases = []
         prereleases = []
-        for version, info in data['releases'].items():
-            # ignore version if no files for release
-            if not info:
-                continue
-            release = Release.from_response(
-                name=dep.base_name,
+        for version, time, python, hashes in data['releases']:
+            release = Release(
+                raw_name=dep.base_name,
                 version=version,
-                info=info,
+                time=time,
+                python=python,
+                hashes=hashes,
                 extra=dep.extra,
             )
 
@@ -118,11 +115,14 @@ class WarehouseAPIRepo(WarehouseBaseRepo):
         cache = TextCache('warehouse-api', urlparse(self.url).hostname, 'deps', name, str(version))
         deps = cache.load()
         if deps is None:
-            task = self._get_from_json(name=name, version=version)
-            deps = await asyncio.gather(asyncio.ensure_future(task))
-            deps = deps[0]
-            cache.dump(deps)
-        elif deps == ['']:
+            async with cache.lock():
+                deps = cache.load()
+                if deps is None:
+                    task = self._get_from_json(name=name, version=version)
+                    deps = await asyncio.gather(asyncio.ensure_future(task))
+                    deps = deps[0]
+                    cache.dump(deps)
+        if deps == ['']:
             return ()
         return self._convert_deps(deps=deps, name=name, version=version, extra=extra)
 
@@ -176,6 +176,25 @@ class WarehouseAPIRepo(WarehouseBaseRepo):
 
     # private methods
 
+    @staticmethod
+    async def _make_releases_table(response) -> dict:
+        """Parse project JSON into info and compact releases table for the cache.
+
+        Dates, versions and python specifiers in the table are already parsed,
+        so releases from the cache are made without parsing anything.
+        """
+        data = await response.json()
+        table = []
+        for version, info in data['releases'].items():
+            # ignore version if no files for release
+            if not info:
+                continue
+            release = Release.from_response(name=data['info']['name'], version=version, info=info)
+            table.append((release.version, release.time, release.python, release.hashes))
+        # long description isn't used but takes the most space
+        info = {key: value for key, value in data['info'].items() if key != 'description'}
+        return dict(info=info, releases=table)
+
     @classmethod
     def _update_dep_from_data(cls, dep, data: dict) -> None:
         """Updates metadata for dependency from json response
@@ -1,20 +1,25 @@
 # built-in
 import re
+import zlib
 from logging import getLogger
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import Tuple
+from typing import Awaitable, Callable, Tuple
 from urllib.parse import urlparse, urlunparse
 
 # external
+from aiohttp import ClientError
 from dephell_markers import Markers
 from packaging.requirements import InvalidRequirement, Requirement
 
 # app
+from ...cache import HTTPCache
 from ...cached_property import cached_property
 from ...constants import WAREHOUSE_DOMAINS
+from ...exceptions import PackageNotFoundError
 from ...networking import aiohttp_session
 from ..base import Interface
+from ._lazy_wheel import fetch_metadata
 
 
 try:
@@ -118,23 +123,78 @@ class WarehouseBaseRepo(Interface):
 
         return tuple(result)
 
+    async def _get_cached(self, *, url: str, name: str, cache: HTTPCache, process: Callable[..., Awaitable]):
+        """Get processed response from the cache or from the server.
+
+        If the cached response is stale, it is revalidated by ETag or Last-Modified,
+        and downloaded again only if it was changed. Only one process at once
+        fetches the response, others wait for it and get it from the cache.
+        """
+        data = cache.load()
+        if data is not None:
+            return data
+
+        async with cache.lock():
+            # it could be fetched by another process while we were waiting for the lock
+            data = cache.load()
+            if data is not None:
+                return data
+
+            kwargs = dict(url=url, name=name, cache=cache, process=process)
+            async with aiohttp_session(auth=self.auth) as session:
+                async with session.get(url, headers=cache.get_headers()) as response:
+                    if response.status != 304:
+                        return await self._process_response(response, **kwargs)
+                    data = cache.revalidate()
+                    if data is not None:
+                        return data
+                # the stale record has gone from the cache, so get the full response
+                async with session.get(url) as response:
+                    return await self._process_response(response, **kwargs)
+
+    @staticmethod
+    async def _process_response(response, *, url: str, name: str, cache: HTTPCache,
+                                process: Callable[..., Awaitable]):
+        if response.status == 404:
+            raise PackageNotFoundError(package=name, url=url)
+        response.raise_for_status()
+        data = await process(response)
+        cache.dump(data, headers=response.headers)
+        return data
+
     async def _download_and_parse(self, *, url: str, converter) -> Tuple[str, ...]:
-        with TemporaryDirectory() as tmp:
-            fname = urlparse(url).path.strip('/').rsplit('/', maxsplit=1)[-1]
-            path = Path(tmp) / fname
-            await self._download(url=url, path=path)
-
-            # load and make separated dep for every env
-            root = converter.load(path)
-            deps = []
-            for dep in root.dependencies:
-                if dep.envs == {'main'}:
+        fname = urlparse(url).path.strip('/').rsplit('/', maxsplit=1)[-1]
+        root = None
+        # read only METADATA from wheel if server supports ranges
+        if fname.endswith('.whl'):
+            content = None
+            try:
+                async with aiohttp_session(auth=self.auth) as session:
+                    content = await fetch_metadata(session=session, url=url)
+            except (ClientError, ValueError, zlib.error):
+                logger.debug('cannot read metadata by ranges', extra=dict(url=url), exc_info=True)
+            if content is not None:
+                root = converter.loads(content=content)
+
+        if root is None:
+            with TemporaryDirectory() as tmp:
+                path = Path(tmp) / fname
+                await self._download(url=url, path=path)
+                root = converter.load(path)
+        return self._get_root_deps(root)
+
+    @staticmethod
+    def _get_root_deps(root) -> Tuple[str, ...]:
+        # make separated dep for every env
+        deps = []
+        for dep in root.dependencies:
+            if dep.envs == {'main'}:
+                deps.append(str(dep))
+            else:
+                for env in dep.envs.copy() - {'main'}:
+                    dep.envs = {env}
                     deps.append(str(dep))
-                else:
-                    for env in dep.envs.copy() - {'main'}:
-                        dep.envs = {env}
-                        deps.append(str(dep))
-            return tuple(deps)
+        return tuple(deps)
 
     async def _download(self, *, url: str, path: Path) -> None:
         async with aiohttp_session(auth=self.auth) as session:
@@ -0,0 +1,130 @@
+# built-in
+import re
+import struct
+import zlib
+from logging import getLogger
+from typing import Optional, Tuple
+
+# external
+import attr
+
+
+logger = getLogger('dephell.repositories.warehouse')
+REX_CONTENT_RANGE = re.compile(r'bytes (\d+)-\d+/\d+')
+
+# how many bytes from the end of archive to request at first.
+# Usually, it's enough for the whole central directory.
+TAIL_SIZE = 64 * 1024
+# local header can have own extra field that isn't in the central directory
+LOCAL_EXTRA_SIZE = 1024
+# https://pkware.cachefly.net/webdocs/casestudies/APPNOTE.TXT
+EOCD = struct.Struct('<4s4H2LH')
+CD_HEADER = struct.Struct('<4s6H3L5H2L')
+LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+EOCD_SIGNATURE = b'PK\x05\x06'
+CD_SIGNATURE = b'PK\x01\x02'
+LOCAL_SIGNATURE = b'PK\x03\x04'
+ZIP64_LIMIT = 0xFFFFFFFF
+
+
+@attr.s(frozen=True, slots=True)
+class _Member:
+    name = attr.ib(type=str)
+    method = attr.ib(type=int)
+    size = attr.ib(type=int)    # compressed
+    offset = attr.ib(type=int)  # of local header
+
+
+async def fetch_metadata(session, url: str) -> Optional[str]:
+    """Read METADATA of the remote wheel without downloading the whole archive.
+
+    It requests by HTTP ranges only the end of the archive with the central directory
+    and the METADATA member from `*.dist-info`. Returns None if the server doesn't
+    support ranges or the archive can't be read in this way (zip64, unknown compression),
+    so the caller has to download the wheel.
+    """
+    response = await _get_range(session=session, url=url, ranges='bytes=-{}'.format(TAIL_SIZE))
+    if response is None:
+        return None
+    tail, tail_start = response
+
+    # end of central directory
+    position = tail.rfind(EOCD_SIGNATURE)
+    if position < 0 or len(tail) - position < EOCD.size:
+        return None
+    *_, directory_size, directory_offset, _comment_size = EOCD.unpack_from(tail, position)
+    if ZIP64_LIMIT in (directory_size, directory_offset):
+        return None
+
+    # central directory
+    if directory_offset >= tail_start:
+        start = directory_offset - tail_start
+        directory = tail[start:start + directory_size]
+    else:
+        response = await _get_range(session=session, url=url, ranges='bytes={}-{}'.format(
+            directory_offset, tail_start - 1,
+        ))
+        if response is None:
+            return None
+        directory = (response[0] + tail)[:directory_size]
+    member = _find_metadata(directory)
+    if member is None:
+        return None
+
+    # local header and data
+    end = member.offset + LOCAL_HEADER.size + len(member.name.encode()) + LOCAL_EXTRA_SIZE + member.size
+    response = await _get_range(session=session, url=url, ranges='bytes={}-{}'.format(member.offset, end - 1))
+    if response is None:
+        return None
+    chunk = response[0]
+    if len(chunk) < LOCAL_HEADER.size:
+        return None
+    fields = LOCAL_HEADER.unpack_from(chunk)
+    if fields[0] != LOCAL_SIGNATURE:
+        return None
+    start = LOCAL_HEADER.size + fields[-2] + fields[-1]
+    data = chunk[start:start + member.size]
+    if len(data) < member.size:
+        return None
+
+    if member.method == 0:      # stored
+        content = data
+    elif member.method == 8:    # deflated
+        content = zlib.decompress(data, -zlib.MAX_WBITS)
+    else:
+        logger.debug('unsupported compression', extra=dict(url=url, method=member.method))
+        return None
+    return content.decode('utf8')
+
+
+async def _get_range(*, session, url: str, ranges: str) -> Optional[Tuple[bytes, int]]:
+    """Get bytes by range and the offset of the first of them.
+    """
+    async with session.get(url, headers={'Range': ranges}) as response:
+        # server ignores ranges and sends the whole file
+        if response.status != 206:
+            logger.debug('ranges are unsupported', extra=dict(url=url, status=response.status))
+            return None
+        match = REX_CONTENT_RANGE.match(response.headers.get('Content-Range', ''))
+        if match is None:
+            return None
+        return await response.read(), int(match.group(1))
+
+
+def _find_metadata(directory: bytes) -> Optional[_Member]:
+    members = []
+    position = 0
+    while position + CD_HEADER.size <= len(directory):
+        fields = CD_HEADER.unpack_from(directory, position)
+        if fields[0] != CD_SIGNATURE:
+            break
+        name_size, extra_size, comment_size = fields[10:13]
+        start = position + CD_HEADER.size
+        name = directory[start:start + name_size].decode('utf8', errors='replace')
+        dirname, _, fname = name.partition('/')
+        if dirname.endswith('.dist-info') and fname == 'METADATA':
+            members.append(_Member(name=name, method=fields[4], size=fields[8], offset=fields[-1]))
+        position = start + name_size + extra_size + comment_size
+    if len(members) != 1:
+        return None
+    return members[0]
@@ -36,7 +36,7 @@ class WarehouseLocalRepo(WarehouseBaseRepo):
         if isinstance(self.path, str):
             self.path = Path(self.path)
 
-    def get_releases(self, dep) -> tuple:
+    async def fetch_releases(self, dep) -> tuple:
 
         releases_info = dict()
         for archive_path in self.path.glob('**/*'):
@@ -86,9 +86,12 @@ class WarehouseLocalRepo(WarehouseBaseRepo):
         cache = TextCache('warehouse-local', 'deps', name, str(version))
         deps = cache.load()
         if deps is None:
-            deps = self._get_deps_from_files(name=name, version=version)
-            cache.dump(deps)
-        elif deps == ['']:
+            async with cache.lock():
+                deps = cache.load()
+                if deps is None:
+                    deps = self._get_deps_from_files(name=name, version=version)
+                    cache.dump(deps)
+        if deps == ['']:
             return ()
         return self._convert_deps(deps=deps, name=name, version=version, extra=extra)
 
@@ -1,27 +1,28 @@
 # built-in
 import asyncio
+import hashlib
 import html
 import posixpath
 from datetime import datetime
 from logging import getLogger
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Tuple
-from urllib.parse import parse_qs, quote, urljoin, urlparse
+from urllib.parse import parse_qs, quote, urldefrag, urljoin, urlparse
 
 # external
 import attr
+from aiohttp import ClientError
 from dephell_specifier import RangeSpecifier
 from packaging.requirements import Requirement
 from packaging.utils import canonicalize_name
 
 # app
-from ...cache import JSONCache, TextCache
+from ...cache import HTTPCache, TextCache
 from ...config import config
 from ...constants import ARCHIVE_EXTENSIONS
-from ...exceptions import PackageNotFoundError
 from ...imports import import_module
 from ...models.release import Release
-from ...networking import requests_session
+from ...networking import aiohttp_session
 from ._base import WarehouseBaseRepo
 
 
@@ -48,8 +49,8 @@ class WarehouseSimpleRepo(WarehouseBaseRepo):
             self.pretty_url = self.url
         self.url = self._get_url(self.url, default_path='/simple/')
 
-    def get_releases(self, dep) -> tuple:
-        links = self._get_links(name=dep.base_name)
+    async def fetch_releases(self, dep) -> tuple:
+        links = await self._get_links(name=dep.base_name)
         releases_info = dict()
         for link in links:
             name, version = self._parse_name(link['name'])
@@ -100,11 +101,14 @@ class WarehouseSimpleRepo(WarehouseBaseRepo):
         cache = TextCache('warehouse-simple', urlparse(self.url).hostname, 'deps', name, str(version))
         deps = cache.load()
         if deps is None:
-            task = self._get_deps_from_links(name=name, version=version)
-            deps = await asyncio.gather(asyncio.ensure_future(task))
-            deps = deps[0]
-            cache.dump(deps)
-        elif deps == ['']:
+            async with cache.lock():
+                deps = cache.load()
+                if deps is None:
+                    task = self._get_deps_from_links(name=name, version=version)
+                    deps = await asyncio.gather(asyncio.ensure_future(task))
+                    deps = deps[0]
+                    cache.dump(deps)
+        if deps == ['']:
             return ()
         return self._convert_deps(deps=deps, name=name, version=version, extra=extra)
 
@@ -112,7 +116,7 @@ class WarehouseSimpleRepo(WarehouseBaseRepo):
         raise NotImplementedError
 
     async def download(self, name: str, version: str, path: Path) -> bool:
-        links = self._get_links(name=name)
+        links = await self._get_links(name=name)
         good_links = []
         for link in links:
             link_name, link_version = self._parse_name(link['name'])
@@ -136,22 +140,21 @@ class WarehouseSimpleRepo(WarehouseBaseRepo):
 
     # private methods
 
-    def _get_links(self, name: str) -> List[Dict[str, str]]:
-        cache = JSONCache(
+    async def _get_links(self, name: str) -> List[Dict[str, str]]:
+        cache = HTTPCache(
             'warehouse-simple', urlparse(self.url).hostname, 'links', name,
             ttl=config['cache']['ttl'],
         )
-        links = cache.load()
-        if links:
-            return links
-
         dep_url = posixpath.join(self.url, quote(name)) + '/'
-        with requests_session() as session:
-            response = session.get(dep_url, auth=self.auth)
-        if response.status_code == 404:
-            raise PackageNotFoundError(package=name, url=dep_url)
-        response.raise_for_status()
-        document = html5lib.parse(response.text, namespaceHTMLElements=False)
+
+        async def process(response) -> List[Dict[str, str]]:
+            return self._parse_links(text=await response.text(), dep_url=dep_url)
+
+        return await self._get_cached(url=dep_url, name=name, cache=cache, process=process)
+
+    @staticmethod
+    def _parse_links(text: str, dep_url: str) -> List[Dict[str, str]]:
+        document = html5lib.parse(text, namespaceHTMLElements=False)
 
         links = []
         for tag in document.findall('.//a'):
@@ -164,20 +167,23 @@ class WarehouseSimpleRepo(WarehouseBaseRepo):
 
             python = tag.get('data-requires-python')
             fragment = parse_qs(parsed.fragment)
-            yield dict(
+            # PEP 714 renamed the attribute from PEP 658, old indexes can still use it
+            metadata = tag.get('data-core-metadata') or tag.get('data-dist-info-metadata')
+            if metadata:
+                metadata = html.unescape(metadata)
+            links.append(dict(
                 url=urljoin(dep_url, link),
                 name=parsed.path.strip('/').split('/')[-1],
                 python=html.unescape(python) if python else '*',
                 digest=fragment['sha256'][0] if 'sha256' in fragment else None,
-            )
-
-        cache.dump(links)
+                metadata=None if metadata in (None, '', 'false') else metadata,
+            ))
         return links
 
     async def _get_deps_from_links(self, name, version):
         from ...converters import SDistConverter, WheelConverter
 
-        links = self._get_links(name=name)
+        links = await self._get_links(name=name)
         good_links = []
         for link in links:
             link_name, link_version = self._parse_name(link['name'])
@@ -201,6 +207,11 @@ class WarehouseSimpleRepo(WarehouseBaseRepo):
             for link in good_links:
                 if not link['name'].endswith(ext):
                     continue
+                # the index serves METADATA of the file separately (PEP 658)
+                if link.get('metadata'):
+                    deps = await self._get_deps_from_metadata(link=link)
+                    if deps is not None:
+                        return deps
                 try:
                     return await self._download_and_parse(
                         url=link['url'],
@@ -209,3 +220,34 @@ class WarehouseSimpleRepo(WarehouseBaseRepo):
                 except FileNotFoundError as e:
                     logger.warning(e.args[0])
         return ()
+
+    async def _get_deps_from_metadata(self, link: Dict[str, str]) -> Optional[Tuple[str, ...]]:
+        from ...converters import WheelConverter
+
+        # drop `#sha256=...` from the file URL
+        url = urldefrag(link['url']).url + '.metadata'
+        # the archive is downloaded if the metadata file isn't available for any reason
+        try:
+            async with aiohttp_session(auth=self.auth) as session:
+                async with session.get(url) as response:
+                    if response.status == 404:
+                        logger.debug('metadata file not found', extra=dict(url=url))
+                        return None
+                    response.raise_for_status()
+                    content = await response.read()
+        except (ClientError, asyncio.TimeoutError):
+            logger.debug('cannot get metadata file', extra=dict(url=url), exc_info=True)
+            return None
+
+        # value of the attribute is `true` or `<hashname>=<hexdigest>`
+        hash_name, _, digest = link['metadata'].partition('=')
+        if digest:
+            if hash_name not in hashlib.algorithms_available:
+                logger.debug('unsupported hash for metadata', extra=dict(url=url, hash=hash_name))
+                return None
+            if hashlib.new(hash_name, content).hexdigest() != digest:
+                logger.warning('metadata hash mismatch', extra=dict(url=url))
+                return None
+
+        root = WheelConverter().loads(content=content.decode('utf8'))
+        return self._get_root_deps(root)
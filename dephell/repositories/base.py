@@ -1,5 +1,6 @@
 # built-in
 import abc
+import asyncio
 import re
 from typing import Dict, Iterable, List, Optional
 
@@ -10,8 +11,16 @@ REX_TOKEN = re.compile(r'^((?P<field>[a-z_]+)\:)?(?P<value>.+)$')
 class Interface(metaclass=abc.ABCMeta):
     propagate = False
 
-    @abc.abstractmethod
     def get_releases(self, dep) -> tuple:
+        """Sync wrapper for `fetch_releases`. Don't call it from coroutines.
+        """
+        loop = asyncio.get_event_loop()
+        return loop.run_until_complete(self.fetch_releases(dep))
+
+    @abc.abstractmethod
+    async def fetch_releases(self, dep) -> tuple:
+        """Get releases of the dependency from the newest to the oldest.
+        """
         pass
 
     @abc.abstractmethod
@@ -0,0 +1,162 @@
+# built-in
+import json
+import os
+from collections import defaultdict
+from logging import getLogger
+from pathlib import Path
+from threading import get_ident
+from time import perf_counter
+from typing import Dict, List, Optional
+
+
+__all__ = ['Tracer', 'tracer']
+logger = getLogger('dephell.tracing')
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'extra', 'start')
+
+    def __init__(self, tracer: 'Tracer', name: str, extra: dict):
+        self.tracer = tracer
+        self.name = name
+        self.extra = extra
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer._add(name=self.name, start=self.start, end=perf_counter(), extra=self.extra)
+        return False
+
+
+class Tracer:
+    """Collect time of resolver phases.
+
+    Spans are recorded only after `start`, so disabled tracer costs almost nothing.
+    Every span has extras as log records have, usually `package` name.
+    Spans can be nested, so totals of phases include time of inner phases.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.events = []        # type: List[dict]
+        self.counters = defaultdict(int)  # type: Dict[str, int]
+        self._origin = 0.0
+
+    def start(self) -> None:
+        self.events = []
+        self.counters = defaultdict(int)
+        self._origin = perf_counter()
+        self.enabled = True
+
+    def stop(self) -> None:
+        self.enabled = False
+
+    def span(self, name: str, **extra):
+        """Context manager to measure time of one phase.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(tracer=self, name=name, extra=extra)
+
+    def count(self, name: str, value: int = 1) -> None:
+        if self.enabled:
+            self.counters[name] += value
+
+    def mark(self, name: str, **extra) -> None:
+        """Record an instant event, like a conflict.
+        """
+        if self.enabled:
+            now = perf_counter()
+            self._add(name=name, start=now, end=now, extra=extra)
+
+    def _add(self, name: str, start: float, end: float, extra: dict) -> None:
+        self.events.append(dict(
+            name=name,
+            start=start - self._origin,
+            duration=end - start,
+            extra=extra,
+        ))
+
+    # export
+
+    def get_summary(self, top: int = 20) -> dict:
+        phases = defaultdict(lambda: dict(count=0, time=0.0))
+        packages = defaultdict(float)
+        for event in self.events:
+            phase = phases[event['name']]
+            phase['count'] += 1
+            phase['time'] += event['duration']
+            package = event['extra'].get('package')
+            if package is not None:
+                packages[(event['name'], package)] += event['duration']
+
+        slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        return dict(
+            phases={
+                name: dict(count=info['count'], time=round(info['time'], 6))
+                for name, info in phases.items()
+            },
+            packages=[
+                dict(phase=phase, package=package, time=round(time, 6))
+                for (phase, package), time in slowest
+            ],
+            counters=dict(self.counters),
+        )
+
+    def get_chrome_trace(self) -> dict:
+        """Trace Event Format, for chrome://tracing and https://ui.perfetto.dev
+        """
+        pid = os.getpid()
+        tid = get_ident()
+        events = []
+        for event in self.events:
+            info = dict(
+                name=event['name'],
+                cat='resolver',
+                ph='X' if event['duration'] else 'i',
+                ts=round(event['start'] * 1e6, 3),
+                pid=pid,
+                tid=tid,
+                args={key: str(value) for key, value in event['extra'].items()},
+            )
+            if event['duration']:
+                info['dur'] = round(event['duration'] * 1e6, 3)
+            else:
+                info['s'] = 't'
+            events.append(info)
+        for name, value in self.counters.items():
+            events.append(dict(name=name, ph='C', ts=0, pid=pid, tid=tid, args=dict(count=value)))
+        return dict(traceEvents=events, displayTimeUnit='ms')
+
+    def dump(self, path: str, format: Optional[str] = None) -> None:
+        if format == 'chrome':
+            data = self.get_chrome_trace()
+        else:
+            data = dict(
+                summary=self.get_summary(),
+                events=[
+                    dict(event, extra={k: str(v) for k, v in event['extra'].items()})
+                    for event in self.events
+                ],
+            )
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open('w', encoding='utf8') as stream:
+            json.dump(data, stream)
+        logger.info('trace saved', extra=dict(path=str(path), events=len(self.events)))
+
+
+tracer = Tracer()
@@ -1,4 +1,5 @@
 # built-in
+import asyncio
 import shutil
 import socket
 from pathlib import Path
@@ -10,6 +11,8 @@ from aioresponses import aioresponses
 
 true_socket = socket.socket
 true_connect = socket.socket.connect
+# the default loop makes sockets, so make it before they are blocked
+asyncio.set_event_loop(asyncio.new_event_loop())
 
 
 class SocketBlockedError(RuntimeError):
@@ -126,3 +129,11 @@ class PatchedAIOResponses(aioresponses):
 def asyncio_mock() -> PatchedAIOResponses:
     with PatchedAIOResponses() as mock:
         yield mock
+
+
+@pytest.fixture
+def asyncio_mock_files() -> PatchedAIOResponses:
+    """Mock for requests to the index, but archives are downloaded from PyPI
+    """
+    with PatchedAIOResponses(passthrough=['https://files.pythonhosted.org']) as mock:
+        yield mock
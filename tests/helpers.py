@@ -71,11 +71,13 @@ def make_root(root, **releases) -> RootDependency:
     return root_dep
 
 
-def check(root, resolved=True, missed=None, **deps):
+def check(root, resolved=True, missed=None, mutator=None, lock=None, **deps):
     resolver = Resolver(
         graph=Graph(root),
-        mutator=Mutator(),
+        mutator=mutator or Mutator(),
     )
+    if lock is not None:
+        resolver.attach_pins(lock)
     with patch(
         target='dephell.controllers._dependency.get_repo',
         return_value=resolver.graph._roots[0].repo,
@@ -105,3 +107,4 @@ def check(root, resolved=True, missed=None, **deps):
     if missed:
         for name in missed:
             assert name not in reqs
+    return resolver
@@ -0,0 +1,187 @@
+# built-in
+import asyncio
+import os
+from time import sleep
+from unittest.mock import patch
+
+# external
+import pytest
+
+# project
+from dephell.cache import BinCache, HTTPBinCache, HTTPCache, JSONCache, Memo, SQLiteStorage, TextCache
+from dephell.config import config
+
+
+@pytest.mark.parametrize('backend', ['files', 'sqlite'])
+def test_load_dump(temp_cache, backend):
+    with patch.dict(config._data['cache'], backend=backend):
+        assert JSONCache('warehouse-api', 'releases', 'dephell').load() is None
+        JSONCache('warehouse-api', 'releases', 'dephell').dump({'0.7.0': []})
+        TextCache('warehouse-api', 'deps', 'dephell', '0.7.0').dump(['attrs', 'requests'])
+        BinCache('some').dump({1, 2})
+
+        assert JSONCache('warehouse-api', 'releases', 'dephell').load() == {'0.7.0': []}
+        assert TextCache('warehouse-api', 'deps', 'dephell', '0.7.0').load() == ['attrs', 'requests']
+        assert BinCache('some').load() == {1, 2}
+
+        cache = BinCache('some')
+        assert cache.exists()
+        cache.delete()
+        assert not cache.exists()
+
+
+@pytest.mark.parametrize('backend', ['files', 'sqlite'])
+def test_ttl(temp_cache, backend):
+    with patch.dict(config._data['cache'], backend=backend):
+        JSONCache('releases', ttl=0).dump([1, 2])
+        assert JSONCache('releases', ttl=-1).load() == [1, 2]
+        sleep(.01)
+        assert JSONCache('releases', ttl=0).load() is None
+        # expired record is kept for revalidation
+        assert JSONCache('releases', ttl=0).load_stale() == [1, 2]
+
+        JSONCache('releases', ttl=0).touch()
+        assert JSONCache('releases', ttl=60).load() == [1, 2]
+
+
+@pytest.mark.parametrize('backend', ['files', 'sqlite'])
+def test_http_revalidate(temp_cache, backend):
+    with patch.dict(config._data['cache'], backend=backend):
+        cache = HTTPCache('releases', ttl=0)
+        assert cache.get_headers() == {}
+        cache.dump([1, 2], headers={'ETag': '"v1"', 'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'})
+        sleep(.01)
+        assert cache.load() is None
+        assert cache.get_headers() == {
+            'If-None-Match': '"v1"',
+            'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT',
+        }
+        assert cache.revalidate() == [1, 2]
+        assert HTTPCache('releases', ttl=60).load() == [1, 2]
+
+
+def test_http_bin_broken(temp_cache, temp_path):
+    HTTPBinCache('releases', 'dephell').dump({1, 2})
+    (temp_path / 'releases' / 'dephell.bin').write_bytes(b'broken')
+    # broken record is the same as missed one
+    assert HTTPBinCache('releases', 'dephell').load() is None
+    assert HTTPBinCache('releases', 'dephell').get_headers() == {}
+
+
+def test_sqlite_one_file(temp_cache, temp_path):
+    with patch.dict(config._data['cache'], backend='sqlite'):
+        for version in range(SQLiteStorage.batch_size + 1):
+            TextCache('deps', 'dephell', str(version)).dump(['attrs'])
+        assert TextCache('deps', 'dephell', '0').load() == ['attrs']
+    names = {path.name for path in temp_path.iterdir()}
+    assert 'deps' not in names
+    assert SQLiteStorage.fname in names
+
+
+def test_sqlite_reconnect_after_fork(temp_path):
+    storage = SQLiteStorage(root=temp_path)
+    connection = storage.connection
+    assert storage.connection is connection
+    # forked process gets own connection
+    with patch('dephell.cache.os.getpid', return_value=-1):
+        assert storage.connection is not connection
+
+
+def test_migrate(temp_cache, temp_path):
+    JSONCache('warehouse-api', 'releases', 'dephell').dump({'0.7.0': []})
+    TextCache('warehouse-api', 'deps', 'dephell', '0.7.0').dump(['attrs', 'requests'])
+    # git clones in the cache dir aren't migrated
+    clone_path = temp_path / 'git' / 'github.com' / 'repo' / 'dephell' / 'dephell'
+    (clone_path / '.git').mkdir(parents=True)
+    (clone_path / 'README.txt').write_text('DepHell')
+
+    with patch.dict(config._data['cache'], backend='sqlite'):
+        assert JSONCache('warehouse-api', 'releases', 'dephell').load() == {'0.7.0': []}
+        assert TextCache('warehouse-api', 'deps', 'dephell', '0.7.0').load() == ['attrs', 'requests']
+    assert not (temp_path / 'warehouse-api').exists()
+    assert (clone_path / 'README.txt').exists()
+
+
+@pytest.mark.parametrize('backend', ['files', 'sqlite'])
+def test_memo(temp_cache, backend):
+    with patch.dict(config._data['cache'], backend=backend):
+        JSONCache('releases').dump({'0.7.0': []})
+        data = JSONCache('releases').load()
+        # parsed only once
+        assert JSONCache('releases').load() is data
+        assert JSONCache('releases').load_stale() is data
+
+        JSONCache('releases').dump({'0.7.1': []})
+        assert JSONCache('releases').load() == {'0.7.1': []}
+
+        # records with mutable objects aren't shared
+        BinCache('some').dump({1, 2})
+        assert BinCache('some').load() is not BinCache('some').load()
+
+
+def test_memo_size():
+    memo = Memo(size=2)
+    memo.set('a', updated=1, data='a')
+    memo.set('b', updated=1, data='b')
+    assert memo.get('a', updated=1) == 'a'
+    memo.set('c', updated=1, data='c')
+    # the least recently used record is dropped
+    assert memo.get('b', updated=1) is Memo.missed
+    assert memo.get('a', updated=1) == 'a'
+    assert memo.get('c', updated=1) == 'c'
+    # the record is changed in the storage
+    assert memo.get('a', updated=2) is Memo.missed
+
+
+def test_dump_atomic(temp_cache, temp_path):
+    JSONCache('releases', 'dephell').dump({'0.7.0': []})
+    JSONCache('releases', 'dephell').dump({'0.7.1': []})
+    assert [path.name for path in (temp_path / 'releases').iterdir()] == ['dephell.json']
+    assert JSONCache('releases', 'dephell').load() == {'0.7.1': []}
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='permissions are unix-only')
+def test_dump_permissions(temp_cache, temp_path):
+    JSONCache('releases', 'dephell').dump({'0.7.0': []})
+    umask = os.umask(0)
+    os.umask(umask)
+    mode = (temp_path / 'releases' / 'dephell.json').stat().st_mode & 0o777
+    assert mode == 0o666 & ~umask
+
+
+@pytest.mark.parametrize('backend', ['files', 'sqlite'])
+def test_lock(temp_cache, backend):
+    events = []
+
+    async def fetch(name: str):
+        cache = JSONCache('releases', 'dephell')
+        async with cache.lock():
+            data = cache.load()
+            if data is None:
+                events.append(name)
+                await asyncio.sleep(.1)
+                cache.dump([name])
+        return cache.load()
+
+    with patch.dict(config._data['cache'], backend=backend):
+        coroutine = asyncio.gather(fetch('first'), fetch('second'))
+        results = asyncio.get_event_loop().run_until_complete(coroutine)
+    # the second one waits for the first one and reuses the result
+    assert events == ['first']
+    assert results == [['first'], ['first']]
+
+
+def test_lock_other_key(temp_cache):
+    events = []
+
+    async def fetch(name: str):
+        cache = JSONCache('releases', name)
+        async with cache.lock():
+            events.append(name)
+            await asyncio.sleep(.1)
+            events.append(name)
+
+    coroutine = asyncio.gather(fetch('first'), fetch('second'))
+    asyncio.get_event_loop().run_until_complete(coroutine)
+    # records are fetched at the same time
+    assert events == ['first', 'second', 'first', 'second']
@@ -0,0 +1,64 @@
+# built-in
+from datetime import datetime
+
+# external
+import pytest
+from packaging.version import Version
+
+# project
+from dephell.models import Constraint, Group, Release, RootDependency
+
+
+@pytest.mark.parametrize('spec, lower, upper', [
+    ('', None, None),
+    ('>=1.5,<=1.9', '1.5', '1.9'),
+    ('==1.2', '1.2', '1.2'),
+    ('>=1,<2 || >=3,<4', '1', '4'),
+    ('<1 || >2', None, None),
+    ('==1.*', None, None),
+    ('!=1.0', None, None),
+])
+def test_bounds(spec, lower, upper):
+    constraint = Constraint(RootDependency(), spec)
+    assert constraint.bounds == (
+        lower and Version(lower),
+        upper and Version(upper),
+    )
+
+
+def test_group_filter():
+    versions = ('2.0', '1.0', '1.5', '1.5+local', '3.0')
+    releases = [Release(raw_name='pack', version=version, time=None) for version in versions]
+    group = Group(number=0, releases=releases)
+
+    constraint = Constraint(RootDependency(), '>=1.5,<3')
+    filtered = group.filter(constraint)
+    assert {str(release.version) for release in filtered} == {'1.5', '1.5+local', '2.0'}
+    # memoized by fingerprint
+    assert group.filter(Constraint(RootDependency(), '>=1.5,<3')) is filtered
+
+    constraint = Constraint(RootDependency(), '<=1.5 || ==3.0')
+    filtered = group.filter(constraint)
+    assert {str(release.version) for release in filtered} == {'1.0', '1.5', '1.5+local', '3.0'}
+
+
+def test_group_filter_memo_size():
+    releases = [Release(raw_name='pack', version='1.{}'.format(minor), time=None) for minor in range(10)]
+    group = Group(number=0, releases=releases)
+    for minor in range(Group.filter_memo_size + 5):
+        group.filter(Constraint(RootDependency(), '>=1.{}'.format(minor)))
+    assert len(group._filtered) == Group.filter_memo_size
+
+
+def test_attach_time_to_copy():
+    root = RootDependency()
+    releases = [Release(raw_name='pack', version='1.0', time=datetime(2019, 1, 1))]
+    constraint = Constraint(root, '==1.0')
+    other = constraint.copy()
+    other.attach_time(releases)
+
+    spec, = other._specs[root.name]._specs
+    assert spec.time == datetime(2019, 1, 1)
+    # specifiers of the original constraint aren't changed
+    spec, = constraint._specs[root.name]._specs
+    assert spec.time is None
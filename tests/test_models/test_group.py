@@ -0,0 +1,45 @@
+# built-in
+from datetime import datetime
+from unittest.mock import patch
+
+# project
+from dephell.config import config
+from dephell.models import Group, Release
+
+
+def make_release(version: str, day: int) -> Release:
+    return Release(raw_name='pkg', version=version, time=datetime(2019, 1, day))
+
+
+def test_best_release():
+    releases = {
+        make_release('1.0', day=1),
+        make_release('1.1', day=3),
+        make_release('2.0', day=2),
+        # the same time as for 1.1
+        make_release('1.2', day=3),
+    }
+    group = Group(number=0, releases=releases)
+    assert group.sorted_versions == tuple(sorted(release.version for release in releases))
+    assert [str(v) for v in group.version_bounds] == ['1.0', '2.0']
+
+    with patch.dict(config._data, strategy='max'):
+        assert str(group.best_release.version) == '1.2'
+    with patch.dict(config._data, strategy='min'):
+        assert str(group.best_release.version) == '1.0'
+
+        # caches are dropped when releases are changed
+        group.releases = {release for release in releases if str(release.version) != '1.0'}
+        assert str(group.best_release.version) == '2.0'
+        assert [str(v) for v in group.version_bounds] == ['1.1', '2.0']
+
+
+def test_same_releases_keep_caches():
+    releases = {make_release('1.0', day=1), make_release('2.0', day=2)}
+    group = Group(number=0, releases=releases)
+    ordered = group.ordered
+    group.releases = set(releases)
+    assert group.ordered is ordered
+
+    group.releases = {make_release('1.0', day=1)}
+    assert group.ordered is not ordered
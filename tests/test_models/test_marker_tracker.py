@@ -20,3 +20,14 @@ def test_bool():
     assert bool(mt) is False
     mt.apply(source='sname', markers='python_version >= "3.5"')
     assert bool(mt) is True
+
+
+def test_copy():
+    mt = MarkerTracker()
+    mt.apply(source='sname', markers='python_version >= "3.5"')
+    mt2 = mt.copy()
+    assert mt2._markers is mt._markers
+
+    mt2.apply(source='other', markers='os_name == "nt"')
+    assert set(mt._markers) == {'sname'}
+    assert set(mt2._markers) == {'sname', 'other'}
@@ -1,3 +1,6 @@
+# built-in
+from copy import copy
+
 # external
 from packaging.requirements import Requirement
 
@@ -5,6 +8,9 @@ from packaging.requirements import Requirement
 from dephell.controllers import DependencyMaker
 from dephell.models import RootDependency
 
+# app
+from ..helpers import Fake, make_root
+
 
 def test_from_requirement():
     root = RootDependency()
@@ -12,3 +18,72 @@ def test_from_requirement():
     dep = DependencyMaker.from_requirement(source=root, req=req)[0]
     assert dep.raw_name == 'Django'
     assert set(str(dep.constraint).split(',')) == {'>=1.5', '<=1.9'}
+
+
+def test_copy():
+    root = RootDependency()
+    req = Requirement('Django>=1.5')
+    dep = DependencyMaker.from_requirement(source=root, req=req)[0]
+    dep2 = dep.copy()
+    assert dep2.constraint._specs is dep.constraint._specs
+    assert dep2.repo is dep.repo
+
+    dep2.constraint.unapply(root.name)
+    dep2.envs.add('dev')
+    assert str(dep.constraint) == '>=1.5'
+    assert str(dep2.constraint) == ''
+    assert dep.envs == {'main'}
+
+
+def test_dependencies_cached_in_group():
+    root = make_root(
+        root=Fake('', 'a'),
+        a=(Fake('1.0', 'b>=1.0'), ),
+        b=(Fake('1.0'), ),
+    )
+    dep = root.dependencies[0]
+    deps = dep.dependencies
+    assert [str(subdep.constraint) for subdep in deps] == ['>=1.0']
+
+    # requirements are parsed once for the group, even for the copy of dep
+    assert dep.copy().dependencies is deps
+
+    # other envs are propagated into deps, so they are made again
+    dep.envs.add('dev')
+    assert dep.dependencies is not deps
+
+
+def test_dependencies_of_other_group():
+    root = make_root(
+        root=Fake('', 'a'),
+        a=(Fake('1.0', 'b>=1.0'), Fake('2.0', 'b>=2.0')),
+        b=(Fake('1.0'), Fake('2.0')),
+    )
+    dep = root.dependencies[0]
+    groups = list(dep.groups)
+    assert len(groups) == 2
+    deps = dep.get_dependencies(groups[1])
+    assert [str(subdep.constraint) for subdep in deps] == ['>=1.0']
+    # made deps refer to the given group, and the dep isn't locked
+    assert deps[0].constraint._groups == {dep.name: groups[1].number}
+    assert not dep.locked
+
+
+def test_dependencies_cached_for_propagated_repo():
+    root = make_root(
+        root=Fake('', 'a'),
+        a=(Fake('1.0', 'b>=1.0'), ),
+        b=(Fake('1.0'), ),
+    )
+    dep = root.dependencies[0]
+    # deps of deps from indexes get the same repo
+    dep.repo.propagate = True
+    deps = dep.dependencies
+    assert deps[0].repo is dep.repo
+    assert dep.copy().dependencies is deps
+
+    # deps made for other repo refer to it
+    other = dep.copy()
+    other.repo = copy(dep.repo)
+    assert other.dependencies is not deps
+    assert other.dependencies[0].repo is other.repo
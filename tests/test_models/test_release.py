@@ -53,3 +53,16 @@ def test_time_compare():
     spec = Specifier('==1.2.3')
     spec.attach_time([release])
     assert release in spec
+
+
+def test_shared_fields():
+    time = datetime(2018, 9, 11, 12, 13)
+    release1 = Release(raw_name='Lol_Kek', version='1.2.3', time=time, hashes=['abc'])
+    release2 = Release(raw_name='lol-kek', version='1.2.3', time=time, hashes=('abc', ))
+
+    assert release1.name == 'lol-kek'
+    assert release1.name is release2.name
+    assert release1.version is release2.version
+    assert release1.hashes is release2.hashes
+    assert release1.dependencies is None
+    assert not hasattr(release1, '__dict__')
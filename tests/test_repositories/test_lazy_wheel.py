@@ -0,0 +1,100 @@
+# built-in
+import asyncio
+import re
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from threading import Thread
+
+# external
+import pytest
+
+# project
+from dephell.converters import WheelConverter
+from dephell.networking import aiohttp_session
+from dephell.repositories import WarehouseAPIRepo
+from dephell.repositories._warehouse._lazy_wheel import fetch_metadata
+
+
+loop = asyncio.get_event_loop()
+REX_RANGE = re.compile(r'bytes=(\d*)-(\d*)')
+
+
+class Handler(BaseHTTPRequestHandler):
+    content = b''
+    ranges = True
+    requests = []
+
+    def do_GET(self):
+        header = self.headers.get('Range')
+        type(self).requests.append(header)
+        match = REX_RANGE.fullmatch(header or '')
+        if not self.ranges or match is None:
+            self._send(200, self.content)
+            return
+
+        size = len(self.content)
+        start, end = match.groups()
+        if not start:
+            start = max(size - int(end), 0)
+            end = size - 1
+        else:
+            start = int(start)
+            end = min(int(end), size - 1) if end else size - 1
+        self._send(206, self.content[start:end + 1], headers={
+            'Content-Range': 'bytes {}-{}/{}'.format(start, end, size),
+        })
+
+    def _send(self, status: int, body: bytes, headers: dict = None):
+        self.send_response(status)
+        for name, value in (headers or dict()).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def wheel_server(requirements_path):
+    Handler.content = (requirements_path / 'wheel.whl').read_bytes()
+    Handler.ranges = True
+    Handler.requests = []
+    server = HTTPServer(('127.0.0.1', 0), Handler)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield 'http://127.0.0.1:{}/dephell-0.2.0-py3-none-any.whl'.format(server.server_port)
+    server.shutdown()
+    server.server_close()
+
+
+async def read_metadata(url):
+    async with aiohttp_session() as session:
+        return await fetch_metadata(session=session, url=url)
+
+
+@pytest.mark.allow_hosts(['127.0.0.1'])
+def test_fetch_metadata(wheel_server):
+    content = loop.run_until_complete(read_metadata(wheel_server))
+    assert 'Requires-Dist: attrs' in content
+    # the tail with central directory and METADATA
+    assert len(Handler.requests) == 2
+    assert all(header.startswith('bytes=') for header in Handler.requests)
+
+
+@pytest.mark.allow_hosts(['127.0.0.1'])
+def test_fetch_metadata_no_ranges(wheel_server):
+    Handler.ranges = False
+    assert loop.run_until_complete(read_metadata(wheel_server)) is None
+
+
+@pytest.mark.allow_hosts(['127.0.0.1'])
+@pytest.mark.parametrize('ranges', [True, False])
+def test_download_and_parse(wheel_server, temp_cache, ranges):
+    Handler.ranges = ranges
+    repo = WarehouseAPIRepo(name='pypi', url='https://pypi.org/pypi/')
+    coroutine = repo._download_and_parse(url=wheel_server, converter=WheelConverter())
+    deps = loop.run_until_complete(coroutine)
+    assert set(deps) == {'attrs', 'cached-property', 'packaging', 'requests'}
+    # without ranges support the whole wheel is downloaded
+    assert (Handler.requests[-1] is not None) is ranges
@@ -2,11 +2,14 @@
 import asyncio
 import json
 from pathlib import Path
+from time import sleep
+from unittest.mock import patch
 
 # external
 import pytest
 
 # project
+from dephell.config import config
 from dephell.constants import DEFAULT_WAREHOUSE
 from dephell.controllers import DependencyMaker
 from dephell.models import Auth, RootDependency
@@ -44,24 +47,24 @@ def test_info_from_files():
     assert set(deps) == {'mistune', 'docutils'}
 
 
-def test_get_releases(requests_mock, temp_cache, fixtures_path: Path):
+def test_get_releases(asyncio_mock, temp_cache, fixtures_path: Path):
     url = 'https://pypi.org/pypi/'
     text = (fixtures_path / 'warehouse-api-package.json').read_text()
-    requests_mock.get(url + 'dephell-shells/json', text=text)
+    asyncio_mock.get(url + 'dephell-shells/json', body=text)
 
     root = RootDependency()
     dep = DependencyMaker.from_requirement(source=root, req='dephell-shells')[0]
     repo = WarehouseAPIRepo(name='pypi', url=url)
     releases = repo.get_releases(dep=dep)
 
-    assert requests_mock.call_count == 1
+    assert len(asyncio_mock.requests) == 1
     assert len(releases) == 4
 
 
-def test_get_releases_auth(requests_mock, temp_cache, fixtures_path: Path):
+def test_get_releases_auth(asyncio_mock, temp_cache, fixtures_path: Path):
     url = 'https://custom.pypi.org/pypi/'
     text = (fixtures_path / 'warehouse-api-package.json').read_text()
-    requests_mock.get(url + 'dephell-shells/json', text=text)
+    asyncio_mock.get(url + 'dephell-shells/json', body=text)
 
     root = RootDependency()
     dep = DependencyMaker.from_requirement(source=root, req='dephell-shells')[0]
@@ -72,9 +75,107 @@ def test_get_releases_auth(requests_mock, temp_cache, fixtures_path: Path):
     ))
     releases = repo.get_releases(dep=dep)
 
-    assert requests_mock.call_count == 1
+    assert len(asyncio_mock.requests) == 1
     assert len(releases) == 4
-    assert requests_mock.last_request.headers['Authorization'] == 'Basic Z3JhbTp0ZXN0'
+    client = list(asyncio_mock.requests.values())[0][0].args[0]
+    assert client._default_headers['authorization'] == 'Basic Z3JhbTp0ZXN0'
+
+
+def test_fetch_releases_concurrently(asyncio_mock, temp_cache, fixtures_path: Path):
+    url = 'https://custom.pypi.org/pypi/'
+    text = (fixtures_path / 'warehouse-api-package.json').read_text()
+    asyncio_mock.get(url + 'dephell-shells/json', body=text)
+    asyncio_mock.get(url + 'dephell-shells-copy/json', body=text)
+
+    root = RootDependency()
+    deps = [
+        DependencyMaker.from_requirement(source=root, req='dephell-shells')[0],
+        DependencyMaker.from_requirement(source=root, req='dephell-shells-copy')[0],
+    ]
+    repo = WarehouseAPIRepo(name='pypi', url=url)
+    coroutines = [repo.fetch_releases(dep=dep) for dep in deps]
+    releases = loop.run_until_complete(asyncio.gather(*coroutines))
+
+    assert len(asyncio_mock.requests) == 2
+    assert [len(dep_releases) for dep_releases in releases] == [4, 4]
+
+
+def test_get_releases_from_cache(asyncio_mock, temp_cache, fixtures_path: Path):
+    url = 'https://pypi.org/pypi/'
+    text = (fixtures_path / 'warehouse-api-package.json').read_text()
+    asyncio_mock.get(url + 'dephell-shells/json', body=text)
+
+    root = RootDependency()
+    repo = WarehouseAPIRepo(name='pypi', url=url)
+    dep = DependencyMaker.from_requirement(source=root, req='dephell-shells')[0]
+    releases = repo.get_releases(dep=dep)
+    dep = DependencyMaker.from_requirement(source=root, req='dephell-shells')[0]
+    cached_releases = repo.get_releases(dep=dep)
+
+    assert len(asyncio_mock.requests) == 1
+    assert dep.description == 'activate virtual environment for current shell'
+    assert [str(release) for release in cached_releases] == [str(release) for release in releases]
+    for release, cached_release in zip(releases, cached_releases):
+        assert cached_release is not release
+        assert cached_release.time == release.time
+        assert str(cached_release.python) == str(release.python)
+        assert cached_release.hashes == release.hashes
+
+
+def test_fetch_releases_single_flight(asyncio_mock, temp_cache, fixtures_path: Path):
+    url = 'https://pypi.org/pypi/'
+    text = (fixtures_path / 'warehouse-api-package.json').read_text()
+    asyncio_mock.get(url + 'dephell-shells/json', body=text)
+
+    root = RootDependency()
+    deps = [
+        DependencyMaker.from_requirement(source=root, req='dephell-shells')[0],
+        DependencyMaker.from_requirement(source=root, req='dephell-shells')[0],
+    ]
+    repo = WarehouseAPIRepo(name='pypi', url=url)
+    coroutines = [repo.fetch_releases(dep=dep) for dep in deps]
+    releases = loop.run_until_complete(asyncio.gather(*coroutines))
+
+    # the second one waits for the first one and gets releases from the cache
+    assert len(list(asyncio_mock.requests.values())[0]) == 1
+    assert [len(dep_releases) for dep_releases in releases] == [4, 4]
+
+
+def test_get_releases_revalidate(asyncio_mock, temp_cache, fixtures_path: Path):
+    url = 'https://pypi.org/pypi/'
+    text = (fixtures_path / 'warehouse-api-package.json').read_text()
+    asyncio_mock.get(url + 'dephell-shells/json', body=text, headers={'ETag': '"v1"'})
+    asyncio_mock.get(url + 'dephell-shells/json', status=304)
+
+    root = RootDependency()
+    dep = DependencyMaker.from_requirement(source=root, req='dephell-shells')[0]
+    repo = WarehouseAPIRepo(name='pypi', url=url)
+    with patch.dict(config._data['cache'], ttl=0):
+        assert len(repo.get_releases(dep=dep)) == 4
+        sleep(.01)
+        # the cache is expired, but the server says that the data isn't modified
+        assert len(repo.get_releases(dep=dep)) == 4
+
+    calls = list(asyncio_mock.requests.values())[0]
+    assert len(calls) == 2
+    assert 'If-None-Match' not in calls[0].kwargs['headers']
+    assert calls[1].kwargs['headers']['If-None-Match'] == '"v1"'
+
+
+def test_get_releases_revalidate_missed_record(asyncio_mock, temp_cache, fixtures_path: Path):
+    url = 'https://pypi.org/pypi/'
+    text = (fixtures_path / 'warehouse-api-package.json').read_text()
+    # the server says that the data isn't modified, but there is nothing in the cache
+    asyncio_mock.get(url + 'dephell-shells/json', status=304)
+    asyncio_mock.get(url + 'dephell-shells/json', body=text)
+
+    root = RootDependency()
+    dep = DependencyMaker.from_requirement(source=root, req='dephell-shells')[0]
+    repo = WarehouseAPIRepo(name='pypi', url=url)
+    assert len(repo.get_releases(dep=dep)) == 4
+
+    calls = list(asyncio_mock.requests.values())[0]
+    assert len(calls) == 2
 
 
 def test_get_deps(asyncio_mock, temp_cache, fixtures_path: Path):
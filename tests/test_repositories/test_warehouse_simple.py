@@ -1,5 +1,6 @@
 # built-in
 import asyncio
+import hashlib
 import re
 from pathlib import Path
 from urllib.parse import urlparse
@@ -59,24 +60,24 @@ def test_extra():
     assert 'cryptography' in deps
 
 
-def test_get_releases_mocked(requests_mock, temp_cache, fixtures_path):
+def test_get_releases_mocked(asyncio_mock, temp_cache, fixtures_path):
     url = 'https://artifactory.example.org/pypi/'
     text = (fixtures_path / 'warehouse-simple.html').read_text()
-    requests_mock.get(url + 'dephell-shells/', text=text)
+    asyncio_mock.get(url + 'dephell-shells/', body=text)
 
     root = RootDependency()
     dep = DependencyMaker.from_requirement(source=root, req='dephell-shells')[0]
     repo = WarehouseSimpleRepo(name='pypi', url=url)
     releases = repo.get_releases(dep=dep)
 
-    assert requests_mock.call_count == 1
+    assert len(asyncio_mock.requests) == 1
     assert len(releases) == 4
 
 
-def test_get_releases_auth(requests_mock, temp_cache, fixtures_path):
+def test_get_releases_auth(asyncio_mock, temp_cache, fixtures_path):
     url = 'https://artifactory.example.org/pypi/'
     text = (fixtures_path / 'warehouse-simple.html').read_text()
-    requests_mock.get(url + 'dephell-shells/', text=text)
+    asyncio_mock.get(url + 'dephell-shells/', body=text)
 
     root = RootDependency()
     dep = DependencyMaker.from_requirement(source=root, req='dephell-shells')[0]
@@ -88,30 +89,30 @@ def test_get_releases_auth(requests_mock, temp_cache, fixtures_path):
     repo = WarehouseSimpleRepo(name='pypi', url=url, auth=auth)
     releases = repo.get_releases(dep=dep)
 
-    assert requests_mock.call_count == 1
+    assert len(asyncio_mock.requests) == 1
     assert len(releases) == 4
-    assert requests_mock.last_request.headers['Authorization'] == 'Basic Z3JhbTp0ZXN0'
+    client = list(asyncio_mock.requests.values())[0][0].args[0]
+    assert client._default_headers['authorization'] == 'Basic Z3JhbTp0ZXN0'
 
 
 @pytest.mark.allow_hosts()  # to download archive
-def test_get_deps(requests_mock, temp_cache, fixtures_path):
+def test_get_deps(asyncio_mock_files, temp_cache, fixtures_path):
     url = 'https://custom.pypi.org/'
     text = (fixtures_path / 'warehouse-simple.html').read_text()
-    requests_mock.get(url + 'dephell-shells/', text=text)
+    asyncio_mock_files.get(url + 'dephell-shells/', body=text)
 
     repo = WarehouseSimpleRepo(name='pypi', url=url)
     coroutine = repo.get_dependencies(name='dephell-shells', version='0.1.2')
     deps = loop.run_until_complete(asyncio.gather(coroutine))[0]
     deps = {dep.name: dep for dep in deps}
     assert set(deps) == {'attrs', 'pexpect', 'shellingham'}
-    assert requests_mock.call_count == 1
 
 
 @pytest.mark.allow_hosts()  # to download archive
-def test_get_deps_auth(requests_mock, temp_cache, fixtures_path):
+def test_get_deps_auth(asyncio_mock_files, temp_cache, fixtures_path):
     url = 'https://custom.pypi.org/'
     text = (fixtures_path / 'warehouse-simple.html').read_text()
-    requests_mock.get(url + 'dephell-shells/', text=text)
+    asyncio_mock_files.get(url + 'dephell-shells/', body=text)
 
     auth = Auth(
         hostname='custom.pypi.org',
@@ -124,11 +125,72 @@ def test_get_deps_auth(requests_mock, temp_cache, fixtures_path):
     deps = {dep.name: dep for dep in deps}
 
     assert set(deps) == {'attrs', 'pexpect', 'shellingham'}
-    assert requests_mock.call_count == 1
-    assert requests_mock.last_request.headers['Authorization'] == 'Basic Z3JhbTp0ZXN0'
+    client = list(asyncio_mock_files.requests.values())[0][0].args[0]
+    assert client._default_headers['authorization'] == 'Basic Z3JhbTp0ZXN0'
 
 
-def test_download(requests_mock, asyncio_mock, temp_cache, fixtures_path: Path,
+METADATA = """Metadata-Version: 2.1
+Name: dephell-shells
+Version: 0.1.2
+Requires-Dist: attrs
+Requires-Dist: pexpect
+"""
+
+
+@pytest.mark.parametrize('attribute', ['data-core-metadata', 'data-dist-info-metadata'])
+@pytest.mark.parametrize('value', [
+    'true',
+    'sha256=' + hashlib.sha256(METADATA.encode()).hexdigest(),
+])
+def test_get_deps_from_metadata(asyncio_mock, temp_cache, attribute, value):
+    url = 'https://custom.pypi.org/'
+    file_url = 'https://files.example.org/dephell_shells-0.1.2-py3-none-any.whl'
+    text = '<a href="{}#sha256=abc" {}="{}">dephell_shells-0.1.2-py3-none-any.whl</a>'
+    asyncio_mock.get(url + 'dephell-shells/', body=text.format(file_url, attribute, value))
+    asyncio_mock.get(file_url + '.metadata', body=METADATA)
+
+    repo = WarehouseSimpleRepo(name='pypi', url=url)
+    coroutine = repo.get_dependencies(name='dephell-shells', version='0.1.2')
+    deps = loop.run_until_complete(asyncio.gather(coroutine))[0]
+    deps = {dep.name: dep for dep in deps}
+    assert set(deps) == {'attrs', 'pexpect'}
+    # the wheel itself isn't downloaded
+    assert len(asyncio_mock.requests) == 2
+
+
+def test_get_deps_from_metadata_bad_hash(asyncio_mock, temp_cache, requirements_path):
+    url = 'https://custom.pypi.org/'
+    file_url = 'https://files.example.org/dephell_shells-0.1.2-py3-none-any.whl'
+    text = '<a href="{}" data-core-metadata="sha256=abc">dephell_shells-0.1.2-py3-none-any.whl</a>'
+    asyncio_mock.get(url + 'dephell-shells/', body=text.format(file_url))
+    asyncio_mock.get(file_url + '.metadata', body=METADATA)
+    asyncio_mock.get(file_url, body=(requirements_path / 'wheel.whl').read_bytes(), repeat=True)
+
+    repo = WarehouseSimpleRepo(name='pypi', url=url)
+    coroutine = repo.get_dependencies(name='dephell-shells', version='0.1.2')
+    deps = loop.run_until_complete(asyncio.gather(coroutine))[0]
+    deps = {dep.name: dep for dep in deps}
+    # deps are taken from the downloaded wheel
+    assert set(deps) == {'attrs', 'cached-property', 'packaging', 'requests'}
+
+
+def test_get_deps_from_metadata_server_error(asyncio_mock, temp_cache, requirements_path):
+    url = 'https://custom.pypi.org/'
+    file_url = 'https://files.example.org/dephell_shells-0.1.2-py3-none-any.whl'
+    text = '<a href="{}" data-core-metadata="true">dephell_shells-0.1.2-py3-none-any.whl</a>'
+    asyncio_mock.get(url + 'dephell-shells/', body=text.format(file_url))
+    asyncio_mock.get(file_url + '.metadata', status=503)
+    asyncio_mock.get(file_url, body=(requirements_path / 'wheel.whl').read_bytes(), repeat=True)
+
+    repo = WarehouseSimpleRepo(name='pypi', url=url)
+    coroutine = repo.get_dependencies(name='dephell-shells', version='0.1.2')
+    deps = loop.run_until_complete(asyncio.gather(coroutine))[0]
+    deps = {dep.name: dep for dep in deps}
+    # deps are taken from the downloaded wheel
+    assert set(deps) == {'attrs', 'cached-property', 'packaging', 'requests'}
+
+
+def test_download(asyncio_mock, temp_cache, fixtures_path: Path,
                   temp_path: Path, requirements_path: Path):
     pypi_url = 'https://custom.pypi.org/pypi/'
     text_response = (fixtures_path / 'warehouse-simple.html').read_text()
@@ -139,7 +201,7 @@ def test_download(requests_mock, asyncio_mock, temp_cache, fixtures_path: Path,
     file_name = urlparse(file_url).path.split('/')[-1]
     file_content = (requirements_path / 'wheel.whl').read_bytes()
 
-    requests_mock.get(pypi_url + 'dephell-shells/', text=text_response)
+    asyncio_mock.get(pypi_url + 'dephell-shells/', body=text_response)
     asyncio_mock.get(file_url, body=file_content)
 
     repo = WarehouseSimpleRepo(name='pypi', url=pypi_url)
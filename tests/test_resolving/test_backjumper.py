@@ -0,0 +1,126 @@
+# built-in
+from unittest.mock import patch
+
+# external
+import pytest
+
+# project
+from dephell.controllers import Backjumper, Graph, Mutator, Resolver
+
+# app
+from ..helpers import Fake, check, make_root
+
+
+def make_diamond():
+    return make_root(
+        root=Fake('', 'a', 'b'),
+        a=(
+            Fake('1.0.0'),
+            Fake('2.0.0', 'c==1.0.0'),
+        ),
+        b=(
+            Fake('1.0.0', 'c==2.0.0'),
+            Fake('2.0.0', 'c==3.0.0'),
+        ),
+        c=(
+            Fake('1.0.0'),
+            Fake('2.0.0'),
+            Fake('3.0.0'),
+        ),
+    )
+
+
+def make_transitive():
+    return make_root(
+        root=Fake('', 'a'),
+        a=(
+            Fake('1', 'b==1'),
+            Fake('2', 'b==2'),
+            Fake('3', 'b==3'),
+        ),
+        b=(
+            Fake('1', 'c'),
+            Fake('2', 'c==2'),
+            Fake('3', 'c==3'),
+        ),
+        c=(
+            Fake('1'),
+        ),
+    )
+
+
+def make_partial_satisfier():
+    return make_root(
+        root=Fake('', 'c', 'y==2'),
+        a=(
+            Fake('1', 'x>=1'),
+        ),
+        b=(
+            Fake('1', 'x<2'),
+        ),
+        c=(
+            Fake('1'),
+            Fake('2', 'a', 'b'),
+            Fake('3', 'a', 'b'),
+        ),
+        x=(
+            Fake('0'),
+            Fake('1', 'y==1'),
+            Fake('2'),
+        ),
+        y=(
+            Fake('1'),
+            Fake('2'),
+        ),
+    )
+
+
+@pytest.mark.parametrize('make, expected', [
+    (make_diamond, dict(a='==1.0.0', b='==2.0.0', c='==3.0.0')),
+    (make_transitive, dict(a='==1', b='==1', c='==1')),
+    (make_partial_satisfier, dict(c='==1', y='==2')),
+])
+def test_fewer_backtracks_than_mutator(make, expected):
+    mutator = Mutator()
+    check(root=make(), mutator=mutator, **expected)
+    backjumper = Backjumper()
+    check(root=make(), mutator=backjumper, **expected)
+
+    assert backjumper.learned > 0
+    assert backjumper.mutations < mutator.mutations
+    assert backjumper.decisions <= mutator.decisions
+
+
+def make_conflict_with_root():
+    return make_root(
+        root=Fake('', 'a', 'b>2'),
+        a=(
+            Fake('1', 'b<1'),
+        ),
+        b=(
+            Fake('1'),
+            Fake('2'),
+            Fake('3'),
+        ),
+    )
+
+
+def resolve(root, mutator) -> bool:
+    resolver = Resolver(graph=Graph(root), mutator=mutator)
+    with patch(
+        target='dephell.controllers._dependency.get_repo',
+        return_value=resolver.graph._roots[0].repo,
+    ):
+        return resolver.resolve(silent=True)
+
+
+def test_conflict_from_root_is_not_mutated():
+    mutator = Mutator()
+    assert resolve(root=make_conflict_with_root(), mutator=mutator) is False
+    backjumper = Backjumper()
+    assert resolve(root=make_conflict_with_root(), mutator=backjumper) is False
+
+    # `a` has only one group, so there is nothing to change
+    assert backjumper.learned == 1
+    assert backjumper.mutations == 0
+    assert mutator.mutations > 0
@@ -0,0 +1,108 @@
+# built-in
+import asyncio
+import multiprocessing
+from queue import Queue
+from unittest.mock import patch
+
+# external
+import pytest
+
+# project
+from dephell.controllers import Graph, Mutator, Resolver
+from dephell.models import Requirement
+
+# app
+from ..helpers import Fake, make_root
+
+
+def make_diamond():
+    return make_root(
+        root=Fake('', 'a', 'b'),
+        a=(
+            Fake('1.0.0'),
+            Fake('2.0.0', 'c==1.0.0'),
+        ),
+        b=(
+            Fake('1.0.0', 'c==2.0.0'),
+            Fake('2.0.0', 'c==3.0.0'),
+        ),
+        c=(
+            Fake('1.0.0'),
+            Fake('2.0.0'),
+            Fake('3.0.0'),
+        ),
+    )
+
+
+def resolve(resolver) -> bool:
+    with patch(
+        target='dephell.controllers._dependency.get_repo',
+        return_value=resolver.graph._roots[0].repo,
+    ):
+        return resolver.resolve(silent=True)
+
+
+def test_candidates_start_from_the_best():
+    resolver = Resolver(graph=Graph(make_diamond()), mutator=Mutator(limit=0))
+    assert resolve(resolver) is False
+    graph = resolver.graph
+    mutator = Mutator()
+    candidates = mutator.get_candidates(graph, count=3)
+    assert 1 < len(candidates) <= 3
+    assert mutator.mutations == 0
+    assert mutator.mutate(graph) == candidates[0]
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason='fork is unsupported')
+@pytest.mark.allow_hosts([])
+def test_resolve_branches():
+    resolver = Resolver(graph=Graph(make_diamond()), mutator=Mutator())
+    resolver.branches = 4
+    assert resolve(resolver) is True
+    assert resolver.mutator.mutations > 0
+
+    reqs = {req.name: req.version for req in Requirement.from_graph(resolver.graph, lock=True)}
+    assert reqs['a'] == '==1.0.0'
+    assert reqs['b'] == '==2.0.0'
+    assert reqs['c'] == '==3.0.0'
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason='fork is unsupported')
+def test_failed_branches_fall_back_to_mutator():
+    def fail(self, groups, results):
+        results.put((False, None))
+
+    resolver = Resolver(graph=Graph(make_diamond()), mutator=Mutator())
+    resolver.branches = 4
+    with patch.object(Resolver, '_resolve_branch', fail):
+        assert resolve(resolver) is True
+    reqs = {req.name: req.version for req in Requirement.from_graph(resolver.graph, lock=True)}
+    assert reqs['c'] == '==3.0.0'
+
+
+@pytest.mark.allow_hosts([])
+def test_branch_flushes_storage():
+    resolver = Resolver(graph=Graph(make_diamond()), mutator=Mutator(limit=0))
+    assert resolve(resolver) is False
+    groups = Mutator().get_candidates(resolver.graph, count=1)[0]
+    resolver.mutator = Mutator()
+    resolver.branches = 4
+
+    results = Queue()
+    loop = asyncio.get_event_loop()
+    try:
+        with patch(target='dephell.controllers._resolver.get_storage') as get_storage:
+            with patch(
+                target='dephell.controllers._dependency.get_repo',
+                return_value=resolver.graph._roots[0].repo,
+            ):
+                resolver._resolve_branch(groups, results)
+    finally:
+        asyncio.set_event_loop(loop)
+
+    # the branch doesn't fork again and saves the cache before exit
+    assert resolver.branches == 1
+    get_storage.return_value.flush.assert_called_once_with()
+    resolved, state = results.get_nowait()
+    assert resolved is True
+    assert state is not None
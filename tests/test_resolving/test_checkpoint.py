@@ -0,0 +1,77 @@
+# built-in
+from unittest.mock import patch
+
+# project
+from dephell.controllers import Backjumper, Checkpoint, Graph, Mutator, Resolver
+from dephell.models import Requirement
+
+# app
+from ..helpers import Fake, make_root
+
+
+def make_diamond():
+    return make_root(
+        root=Fake('', 'a', 'b'),
+        a=(
+            Fake('1.0.0'),
+            Fake('2.0.0', 'c==1.0.0'),
+        ),
+        b=(
+            Fake('1.0.0', 'c==2.0.0'),
+            Fake('2.0.0', 'c==3.0.0'),
+        ),
+        c=(
+            Fake('1.0.0'),
+            Fake('2.0.0'),
+            Fake('3.0.0'),
+        ),
+    )
+
+
+def resolve(resolver, checkpoint, resume: bool = False) -> bool:
+    with patch(
+        target='dephell.controllers._dependency.get_repo',
+        return_value=resolver.graph._roots[0].repo,
+    ):
+        if resume:
+            assert checkpoint.restore(resolver)
+        return resolver.resolve(silent=True, checkpoint=checkpoint)
+
+
+def test_mutator_state():
+    mutator = Backjumper()
+    mutator.mutations = 3
+    mutator.remember([])
+    mutator._incompatibilities.add(frozenset({('a', 1), ('b', 0)}))
+
+    restored = Backjumper()
+    restored.set_state(mutator.get_state())
+    assert restored.mutations == 3
+    assert restored._snapshots == mutator._snapshots
+    assert restored._incompatibilities == mutator._incompatibilities
+
+
+def test_resume(temp_cache):
+    checkpoint = Checkpoint(key='diamond')
+    resolver = Resolver(graph=Graph(make_diamond()), mutator=Mutator(limit=0))
+    assert resolve(resolver, checkpoint) is False
+    assert checkpoint.cache.path.exists()
+
+    resolver = Resolver(graph=Graph(make_diamond()), mutator=Mutator())
+    assert resolve(resolver, checkpoint, resume=True) is True
+    assert not checkpoint.cache.path.exists()
+
+    reqs = {req.name: req.version for req in Requirement.from_graph(resolver.graph, lock=True)}
+    assert reqs['a'] == '==1.0.0'
+    assert reqs['b'] == '==2.0.0'
+    assert reqs['c'] == '==3.0.0'
+
+
+def test_other_roots(temp_cache):
+    checkpoint = Checkpoint(key='diamond')
+    resolver = Resolver(graph=Graph(make_diamond()), mutator=Mutator(limit=0))
+    assert resolve(resolver, checkpoint) is False
+
+    root = make_root(root=Fake('', 'a'), a=(Fake('1.0.0'), ))
+    resolver = Resolver(graph=Graph(root), mutator=Mutator())
+    assert checkpoint.restore(resolver) is False
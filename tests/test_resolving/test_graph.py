@@ -0,0 +1,108 @@
+# built-in
+from unittest.mock import patch
+
+# project
+from dephell.controllers import Graph, Mutator, Resolver
+
+# app
+from ..helpers import Fake, make_root
+
+
+def resolve(root) -> Resolver:
+    resolver = Resolver(
+        graph=Graph(root),
+        mutator=Mutator(),
+    )
+    with patch(
+        target='dephell.controllers._dependency.get_repo',
+        return_value=resolver.graph._roots[0].repo,
+    ):
+        resolver.resolve(silent=True)
+    return resolver
+
+
+def test_get_parents():
+    root = make_root(
+        root=Fake('', 'a', 'b'),
+        a=(Fake('1.0', 'c'), ),
+        b=(Fake('1.0', 'd'), ),
+        c=(Fake('1.0', 'd'), ),
+        d=(Fake('1.0'), ),
+    )
+    graph = resolve(root).graph
+
+    parents = graph.get_parents(graph.get('d'))
+    assert set(parents) == {root.name, 'a', 'b', 'c'}
+
+    parents = graph.get_parents(graph.get('c'))
+    assert set(parents) == {root.name, 'a'}
+
+    parents = graph.get_parents(graph.get('a'))
+    assert set(parents) == {root.name}
+
+
+def test_get_parents_doesnt_lock():
+    root = make_root(
+        root=Fake('', 'a'),
+        a=(Fake('1.0', 'b'), ),
+        b=(Fake('1.0'), ),
+    )
+    graph = resolve(root).graph
+    dep = graph.get('a')
+    dep.unlock()
+
+    parents = graph.get_parents(graph.get('b'))
+    assert set(parents) == {root.name, 'a'}
+    assert not dep.locked
+
+
+def test_connect_replaces_edges():
+    root = make_root(
+        root=Fake('', 'a'),
+        a=(Fake('1.0', 'b'), ),
+        b=(Fake('1.0'), ),
+    )
+    graph = resolve(root).graph
+
+    graph.connect('a')
+    assert set(graph.get_parents(graph.get('b'))) == set()
+    graph.connect('a', 'b')
+    assert set(graph.get_parents(graph.get('b'))) == {root.name, 'a'}
+
+
+def test_get_layer():
+    root = make_root(
+        root=Fake('', 'a', 'b'),
+        a=(Fake('1.0', 'c'), ),
+        b=(Fake('1.0', 'c'), ),
+        c=(Fake('1.0', 'd'), ),
+        d=(Fake('1.0'), ),
+    )
+    graph = resolve(root).graph
+
+    assert graph.get_layer(root).level == 0
+    assert graph.get_layer('a').level == 1
+    assert graph.get_layer(graph.get('c')).level == 2
+    assert graph.get_layer('d').level == 3
+
+
+def test_get_leafs_after_unapply():
+    root = make_root(
+        root=Fake('', 'a', 'b'),
+        a=(Fake('1.0', 'c'), ),
+        b=(Fake('1.0'), ),
+        c=(Fake('1.0'), ),
+    )
+    resolver = resolve(root)
+    graph = resolver.graph
+    assert graph.get_leafs() == ()
+
+    # unapplied deps are returned in the order of layers
+    resolver.unapply(graph.get('c'))
+    resolver.unapply(graph.get('b'))
+    assert [dep.name for dep in graph.get_leafs()] == ['b', 'c']
+    assert [dep.name for dep in graph.get_leafs(level=1)] == ['b']
+
+    # leafs are returned until they are applied
+    resolver.apply(graph.get('b'))
+    assert [dep.name for dep in graph.get_leafs()] == ['c']
@@ -0,0 +1,59 @@
+# external
+from packaging.version import Version
+
+# project
+from dephell.controllers import Graph, Mutator, Resolver
+
+# app
+from ..helpers import Fake, check, make_root
+
+
+def make(*reqs):
+    return make_root(
+        root=Fake('', *reqs),
+        a=(
+            Fake('1.0.0', 'c'),
+            Fake('2.0.0', 'c'),
+        ),
+        b=(
+            Fake('1.0.0', 'c>=2.0.0'),
+        ),
+        c=(
+            Fake('1.0.0'),
+            Fake('2.0.0'),
+            Fake('3.0.0'),
+        ),
+    )
+
+
+def test_attach_pins():
+    resolver = Resolver(graph=Graph(make('a')), mutator=Mutator())
+    assert resolver.attach_pins(make('a==1.0.0', 'c==1.0.0', 'b')) == 2
+    assert set(resolver.pins) == {'a', 'c'}
+    assert str(resolver.pins['a']) == '1.0.0'
+
+
+def test_keep_compatible_pins():
+    lock = make('a==1.0.0', 'c==1.0.0')
+
+    # without pins the latest versions are chosen
+    check(root=make('a', 'b'), a='==2.0.0', b='==1.0.0', c='==3.0.0')
+
+    # the pin for `a` is kept, the pin for `c` is broken by the new dep
+    check(root=make('a', 'b'), lock=lock, a='==1.0.0', b='==1.0.0', c='==3.0.0')
+
+    # all pins are kept if nothing is changed
+    check(root=make('a'), lock=lock, a='==1.0.0', c='==1.0.0')
+
+
+def test_pinned_group_loads_only_pinned_release():
+    dep = make('a').dependencies[0]
+    dep.pin = Version('1.0.0')
+    assert str(dep.group.best_release.version) == '1.0.0'
+    assert dep.group.number == dep.groups.pinned_number
+
+    # deps of the newer release aren't loaded, and it isn't grouped
+    releases = {str(release.version): release for release in dep.groups.releases}
+    assert releases['1.0.0'].dependencies is not None
+    assert releases['2.0.0'].dependencies is None
+    assert not dep.groups._loaded_groups
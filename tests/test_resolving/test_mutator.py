@@ -5,7 +5,7 @@ from unittest.mock import patch
 from dephell.controllers import Graph, Mutator, Resolver
 
 # app
-from ..helpers import Fake, make_root
+from ..helpers import Fake, check as check_resolved, make_root
 
 
 def check(root, conflict, mutations):
@@ -53,3 +53,33 @@ def test_mutator_diamond():
         ),
     )
     check(root=root, conflict='c', mutations=4)
+
+
+def test_mutation_changes_groups():
+    root = make_root(
+        root=Fake('', 'a', 'b>2'),
+        a=(
+            Fake('1', 'b'),
+            Fake('2', 'b<1'),
+        ),
+        b=(
+            Fake('2'),
+            Fake('3'),
+            Fake('4'),
+        ),
+    )
+    mutator = Mutator()
+    check_resolved(root=root, mutator=mutator, a='==1', b='==4')
+    # the first mutation has to change something, not to re-apply the same groups
+    assert mutator.mutations == 1
+    assert mutator.decisions == 1
+
+
+def test_snapshot_ignores_order():
+    root = make_root(
+        root=Fake('', 'a', 'b'),
+        a=(Fake('1.0'), ),
+        b=(Fake('1.0'), ),
+    )
+    groups = [dep.group for dep in root.dependencies]
+    assert Mutator._make_snapshot(groups) == Mutator._make_snapshot(groups[::-1])
@@ -0,0 +1,80 @@
+# built-in
+from concurrent.futures import wait
+from unittest.mock import patch
+
+# external
+import pytest
+
+# project
+from dephell.controllers import DependencyMaker, Graph, Mutator, Prefetcher, Resolver
+from dephell.models import RootDependency
+from dephell.repositories import GitRepo, LocalRepo, ReleaseRepo
+
+# app
+from ..helpers import Fake, check, make_root
+
+
+def make():
+    return make_root(
+        root=Fake('', 'a', 'b>=2.0'),
+        a=(Fake('1.0', 'b'), ),
+        b=(Fake('1.0'), Fake('2.0'), Fake('3.0')),
+    )
+
+
+# threads make own event loops, and it needs sockets, but not connections
+@pytest.mark.allow_hosts([])
+def test_schedule():
+    root = make()
+    prefetcher = Prefetcher(limit=2)
+    get_releases = ReleaseRepo.get_releases
+    with patch.object(ReleaseRepo, 'get_releases', autospec=True, side_effect=get_releases) as mocked:
+        assert prefetcher.schedule(root.dependencies) == 2
+        # deps are scheduled only once
+        assert prefetcher.schedule(root.dependencies) == 0
+        wait(prefetcher._futures)
+        prefetcher.close()
+    assert sorted(call[0][1].name for call in mocked.call_args_list) == ['a', 'b']
+    # deps given to the prefetcher aren't changed
+    assert all('groups' not in dep.__dict__ for dep in root.dependencies)
+
+
+def test_schedule_propagated_repo():
+    # deps from the index get a repo that propagates to their deps
+    dep = DependencyMaker.from_requirement(source=RootDependency(), req='requests')[0]
+    assert dep.repo.propagate
+    prefetcher = Prefetcher(limit=4)
+    with patch.object(Prefetcher, '_fetch') as mocked:
+        assert prefetcher.schedule([dep]) == 1
+        wait(prefetcher._futures)
+        prefetcher.close()
+    assert mocked.call_args[0][0].name == 'requests'
+
+
+def test_skip_git_and_local():
+    root = RootDependency()
+    url = 'git+https://github.com/dephell/dephell'
+    git_dep = DependencyMaker.from_requirement(source=root, req='dephell', url=url)[0]
+    local_dep = DependencyMaker.from_requirement(source=root, req='project')[0]
+    local_dep.repo = LocalRepo(path='.')
+    assert isinstance(git_dep.repo, GitRepo)
+    assert Prefetcher(limit=4).schedule([git_dep, local_dep]) == 0
+
+
+def test_best_release():
+    root = make()
+    dep = root.dependencies[1]
+    releases = root.repo.get_releases(dep)
+    assert str(Prefetcher._get_best_release(dep, releases).version) == '3.0'
+
+
+def test_disabled():
+    assert Prefetcher(limit=0).schedule(make().dependencies) == 0
+
+
+def test_resolve_with_prefetch():
+    resolver = Resolver(graph=Graph(make()), mutator=Mutator())
+    resolver.prefetcher.limit = 4
+    assert resolver.resolve(silent=True)
+    assert resolver.prefetcher._executor is None
+    check(root=make(), a='==1.0', b='==3.0')
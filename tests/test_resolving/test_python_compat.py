@@ -3,7 +3,9 @@ import pytest
 from dephell_specifier import RangeSpecifier
 
 # project
+from dephell.constants import PYTHON_VERSIONS
 from dephell.models import Dependency, Group, MarkerTracker, Release
+from dephell.models.python_mask import ALL_PYTHONS, get_python_mask
 
 
 @pytest.mark.parametrize('pdep, prel, ok', [
@@ -44,3 +46,26 @@ def test_python_compat(pdep: str, prel: str, ok: bool):
     )
     dep.groups = [Group(number=1, releases=[release])]
     assert dep.python_compat is ok
+
+
+def test_python_mask():
+    release = Release(raw_name='pathlib2', version='2.3.3', time=None)
+    assert release.python_mask == ALL_PYTHONS
+
+    release.python = RangeSpecifier('>=3.9')
+    assert release.python_mask == get_python_mask(RangeSpecifier('>=3.9'))
+    first = PYTHON_VERSIONS.index('3.9')
+    expected = sum(1 << bit for bit in range(first, len(PYTHON_VERSIONS)))
+    assert release.python_mask == expected
+
+    group = Group(number=0, releases=[release])
+    assert group.python_mask == expected
+    assert group.python_compat(get_python_mask(RangeSpecifier('>=3.10'))) is True
+    assert group.python_compat(get_python_mask(RangeSpecifier('<3.0'))) is False
+
+
+def test_python_mask_new_pythons():
+    mask = get_python_mask(RangeSpecifier('>=3.11'))
+    assert mask != 0
+    assert mask == get_python_mask(RangeSpecifier('>=3.11,<3.15'))
+    assert mask & get_python_mask(RangeSpecifier('<3.11')) == 0
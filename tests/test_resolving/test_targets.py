@@ -0,0 +1,105 @@
+# built-in
+from unittest.mock import patch
+
+# external
+import pytest
+from dephell_specifier import RangeSpecifier
+
+# project
+from dephell.config import config
+from dephell.controllers import Graph, Mutator, Resolver
+from dephell.models import Target
+
+# app
+from ..helpers import Fake, make_root
+
+
+def resolve(resolver) -> bool:
+    with patch(
+        target='dephell.controllers._dependency.get_repo',
+        return_value=resolver.graph._roots[0].repo,
+    ):
+        return resolver.resolve(silent=True)
+
+
+@pytest.mark.parametrize('text, python, platform', [
+    ('3.8', '3.8', None),
+    ('3.8-linux', '3.8', 'linux'),
+    ('2.7-win32', '2.7', 'win32'),
+])
+def test_parse_target(text, python, platform):
+    target = Target.parse(text)
+    assert target.python == python
+    assert target.platform == platform
+    assert str(target) == text
+
+
+@pytest.mark.parametrize('text', ['3', '3.8.1', '3.8-linux-win32', '3.x'])
+def test_parse_bad_target(text):
+    with pytest.raises(ValueError):
+        Target.parse(text)
+
+
+def test_target_environment():
+    target = Target.parse('3.7-win32')
+    assert target.environment['python_version'] == '3.7'
+    assert target.environment['sys_platform'] == 'win32'
+    assert target.environment['os_name'] == 'nt'
+    assert target.marker == 'python_version == "3.7" and sys_platform == "win32"'
+
+
+def test_apply_targets():
+    root = make_root(
+        root=Fake('', 'a', 'b; python_version < "3.8"'),
+        a=(Fake('1.0', 'c; sys_platform == "win32"'), ),
+        b=(Fake('1.0', 'd'), ),
+        c=(Fake('1.0'), ),
+        d=(Fake('1.0'), ),
+    )
+    resolver = Resolver(graph=Graph(root), mutator=Mutator())
+    assert resolve(resolver)
+    resolver.apply_targets([Target.parse('3.7-linux'), Target.parse('3.8-linux')])
+
+    names = {dep.name for dep in resolver.graph}
+    # `c` is required only for windows
+    assert names == {'a', 'b', 'd'}
+
+    assert not resolver.graph.get('a').marker
+    # `d` has no markers, but it is required only by `b`
+    for name in ('b', 'd'):
+        marker = str(resolver.graph.get(name).marker)
+        assert 'python_version == "3.7"' in marker
+        assert 'python_version == "3.8"' not in marker
+
+
+def test_targets_restrict_releases():
+    root = make_root(
+        root=Fake('', 'a'),
+        a=(Fake('1.0', 'b'), Fake('2.0', 'b')),
+        b=(Fake('1.0'), ),
+    )
+    for release in root.repo.releases:
+        if str(release.version) == '2.0':
+            release.python = RangeSpecifier('>=3.8')
+
+    # the latest release doesn't support one of targets
+    with patch.dict(config._data, targets=['3.7', '3.8-linux']):
+        resolver = Resolver(graph=Graph(root), mutator=Mutator())
+        assert resolve(resolver)
+    assert str(resolver.graph.get('a').group.best_release.version) == '1.0'
+
+
+def test_targets_no_compatible_releases():
+    root = make_root(
+        root=Fake('', 'a'),
+        a=(Fake('1.0', 'b'), ),
+        b=(Fake('1.0'), ),
+    )
+    for release in root.repo.releases:
+        if release.name == 'a':
+            release.python = RangeSpecifier('>=3.8')
+
+    with patch.dict(config._data, targets=['3.7']):
+        resolver = Resolver(graph=Graph(root), mutator=Mutator())
+        with pytest.raises(LookupError):
+            resolve(resolver)
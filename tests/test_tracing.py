@@ -0,0 +1,65 @@
+# built-in
+import json
+
+# project
+from dephell.tracing import Tracer
+
+
+def test_disabled():
+    tracer = Tracer()
+    with tracer.span('apply', package='django'):
+        pass
+    tracer.count('cache_hit')
+    assert tracer.events == []
+    assert dict(tracer.counters) == {}
+
+
+def test_summary():
+    tracer = Tracer()
+    tracer.start()
+    with tracer.span('iteration'):
+        with tracer.span('apply', package='django'):
+            pass
+        with tracer.span('apply', package='django'):
+            pass
+        with tracer.span('apply', package='flask'):
+            pass
+    tracer.count('cache_hit')
+    tracer.count('cache_hit')
+    tracer.stop()
+
+    summary = tracer.get_summary()
+    assert summary['phases']['apply']['count'] == 3
+    assert summary['phases']['iteration']['count'] == 1
+    assert {info['package'] for info in summary['packages']} == {'django', 'flask'}
+    assert summary['counters'] == {'cache_hit': 2}
+
+
+def test_dump_chrome(tmp_path):
+    tracer = Tracer()
+    tracer.start()
+    with tracer.span('get_releases', package='django'):
+        pass
+    tracer.mark('conflict', package='django')
+    tracer.count('cache_miss')
+    tracer.stop()
+
+    path = tmp_path / 'trace.json'
+    tracer.dump(path=str(path), format='chrome')
+    events = json.loads(path.read_text())['traceEvents']
+    assert [event['ph'] for event in events] == ['X', 'i', 'C']
+    assert events[0]['args'] == {'package': 'django'}
+
+
+def test_dump_json(tmp_path):
+    tracer = Tracer()
+    tracer.start()
+    with tracer.span('get_releases', package='django'):
+        pass
+    tracer.stop()
+
+    path = tmp_path / 'trace.json'
+    tracer.dump(path=str(path))
+    data = json.loads(path.read_text())
+    assert data['summary']['phases']['get_releases']['count'] == 1
+    assert data['events'][0]['extra'] == {'package': 'django'}